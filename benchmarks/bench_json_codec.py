@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+JSON codec benchmark - parse SWAIG requests and serialize SWAIG responses
+Runs every available codec over the payloads in benchmarks/payloads, over files given on the command line,
+or over the real requests and responses in a session recording (see BLACKJACK_RECORD_FILE).
+The bundled payloads are synthetic - built in the shape of this bot's tool calls, with placeholder caller fields.
+
+Usage: python benchmarks/bench_json_codec.py [--iterations 5000] [payload.json ...]
+       python benchmarks/bench_json_codec.py --recording sessions.jsonl.gz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "bot"))
+
+import swaig_codec
+from session_recorder import read_recording
+
+PAYLOAD_DIR = Path(__file__).resolve().parent / "payloads"
+
+
+def time_per_op(fn, args, iterations):
+    """Best of three runs, in microseconds per call, averaged over args"""
+    rounds = max(1, iterations // len(args))
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for arg in args:
+                fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best / (rounds * len(args)) * 1e6
+
+
+def recorded_payloads(path):
+    """Every recorded SWAIG request and response, grouped by tool"""
+    payloads = {}
+    for entry in read_recording(path):
+        if entry["kind"] == "swaig":
+            for part in ("request", "response"):
+                label = f"swaig_{entry['function']}_{part}"
+                payloads.setdefault(label, []).append(swaig_codec.CODECS["json"].dumps(entry[part]))
+    return sorted(payloads.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SWAIG JSON codecs")
+    parser.add_argument("payloads", nargs="*", type=Path, help="Payload JSON files (default: benchmarks/payloads/*.json)")
+    parser.add_argument("--recording", type=Path, help="Benchmark the payloads in a session recording instead")
+    parser.add_argument("--iterations", "-n", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.recording:
+        payloads = recorded_payloads(args.recording)
+    else:
+        paths = args.payloads or sorted(PAYLOAD_DIR.glob("*.json"))
+        payloads = [(path.stem, [path.read_bytes()]) for path in paths]
+    codecs = [swaig_codec.CODECS[name] for name in swaig_codec.PREFERENCE if name in swaig_codec.CODECS]
+
+    print(f"Codecs: {', '.join(codec.name for codec in codecs)} (default: {swaig_codec.active_codec()})")
+    print(f"{'payload':<32} {'count':>6} {'bytes':>7}" + "".join(f" {codec.name + ' loads':>14} {codec.name + ' dumps':>14}" for codec in codecs))
+
+    totals = {codec.name: [0.0, 0.0] for codec in codecs}
+    for label, raws in payloads:
+        objs = [swaig_codec.CODECS["json"].loads(raw) for raw in raws]
+        row = f"{label:<32} {len(raws):>6} {sum(map(len, raws)) // len(raws):>7}"
+        for codec in codecs:
+            load_us = time_per_op(codec.loads, raws, args.iterations)
+            dump_us = time_per_op(codec.dumps, objs, args.iterations)
+            totals[codec.name][0] += load_us
+            totals[codec.name][1] += dump_us
+            row += f" {load_us:>12.1f}us {dump_us:>12.1f}us"
+        print(row)
+
+    print(f"{'total':<32} {'':>6} {'':>7}" + "".join(f" {totals[c.name][0]:>12.1f}us {totals[c.name][1]:>12.1f}us" for c in codecs))
+    baseline = sum(totals["json"])
+    for codec in codecs:
+        if codec.name != "json":
+            print(f"{codec.name} speedup over stdlib json: {baseline / sum(totals[codec.name]):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
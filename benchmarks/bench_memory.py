@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for in-flight table state
+Fills a TableEngine with tables that each have a hand in progress, and measures bytes per active
+table with tracemalloc. "wire" keeps every seat's game_state (and shared shoe) as the decoded
+global_data dicts, the way the dealer held them before TableState; "compact" keeps TableState.
+
+Usage: python benchmarks/bench_memory.py [--tables 1000 10000] [--seats 1]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "bot"))
+
+from table_engine import TableEngine
+from table_state import TableState, new_deck, wire_cards
+
+
+def hand_in_progress(rng):
+    """A wire game_state a few cards into a hand, as it arrives in global_data"""
+    state = TableState()
+    state.deck = new_deck()
+    rng.shuffle(state.deck)
+    state.current_bet = 50
+    state.player_chips = 950
+    state.game_phase = "playing"
+    state.hand_in_progress = True
+    state.deal_player(state.deck)
+    state.deal_player(state.deck)
+    state.deal_dealer(state.deck)
+    state.deal_dealer(state.deck)
+    if state.player_score < 12:
+        state.deal_player(state.deck)
+    return json.dumps(state.to_wire())
+
+
+def fill(engine, tables, seats, layout, payloads):
+    for t in range(tables):
+        table_id = f"table-{t}"
+        for s in range(seats):
+            call_id = f"call-{t}-{s}"
+            engine.seat(table_id if seats > 1 else call_id, call_id)
+            game_state = json.loads(payloads[(t * seats + s) % len(payloads)])
+            engine.record_state(call_id, game_state if layout == "wire" else TableState.from_wire(game_state))
+        if seats > 1:
+            table = engine.tables[table_id]
+            table.prepare_shoe()
+            if layout == "wire":
+                table.shoe = json.loads(json.dumps(wire_cards(table.shoe)))
+
+
+def measure(tables, seats, layout):
+    rng = random.Random(tables)
+    payloads = [hand_in_progress(rng) for _ in range(256)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    engine = TableEngine(rng=rng)
+    fill(engine, tables, seats, layout, payloads)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del engine
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bytes per active table")
+    parser.add_argument("--tables", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seats", type=int, default=1, help="Seats per table; more than one shares a shoe")
+    args = parser.parse_args()
+
+    print(f"{args.seats} seat(s)/table, every seat mid-hand")
+    print(f"{'tables':>7} {'layout':>8} {'bytes/table':>12} {'total MB':>9} {'saving':>7}")
+    for tables in args.tables:
+        wire = measure(tables, args.seats, "wire")
+        compact = measure(tables, args.seats, "compact")
+        print(f"{tables:>7} {'wire':>8} {wire / tables:>12.0f} {wire / 1e6:>9.1f}")
+        print(f"{tables:>7} {'compact':>8} {compact / tables:>12.0f} {compact / 1e6:>9.1f} {wire / compact:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Response length and generation time per tool, in verbose and terse mode
+Plays the same seeded hands through the real tool handlers once per mode
+(basic strategy: double on 10/11, hit below 17, otherwise stand)
+
+Usage: python benchmarks/bench_responses.py [--hands 500] [--budget 160] [--seed 7]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "bot"))
+
+from phrases import MODES, Phrasebook
+from sigmond_blackjack import BlackjackDealer
+
+TOOLS = ["place_bet", "hit", "stand", "double_down", "new_hand"]
+
+
+def saved_global_data(result, global_data):
+    """Pull the set_global_data action back out of a tool result, as SignalWire would"""
+    for action in result.to_dict().get("action", []):
+        if "set_global_data" in action:
+            return action["set_global_data"]
+    return global_data
+
+
+def play(agent, hands, seed):
+    """Play hands through on_function_call and return {tool: [(chars, seconds), ...]}"""
+    agent.rng.seed(seed)
+    samples = {tool: [] for tool in TOOLS}
+    global_data = {"current_chips": 1000}
+
+    def call(tool, args=None):
+        nonlocal global_data
+        raw_data = {"call_id": "bench-call", "function": tool, "global_data": global_data}
+        start = time.perf_counter()
+        result = agent.on_function_call(tool, args or {}, raw_data)
+        elapsed = time.perf_counter() - start
+        samples[tool].append((len(result.response), elapsed))
+        global_data = saved_global_data(result, global_data)
+        return global_data.get("game_state", {})
+
+    for _ in range(hands):
+        game_state = call("place_bet", {"amount": 50})
+        while game_state.get("game_phase") == "playing":
+            score = game_state["player_score"]
+            if score in (10, 11) and len(game_state["player_hand"]) == 2 and game_state["player_chips"] >= game_state["current_bet"]:
+                game_state = call("double_down")
+            elif score < 17:
+                game_state = call("hit")
+            else:
+                game_state = call("stand")
+        game_state = call("new_hand")
+        if game_state["player_chips"] < 100:
+            global_data["game_state"]["player_chips"] = 1000
+
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tool response length and build time per mode")
+    parser.add_argument("--hands", "-n", type=int, default=500)
+    parser.add_argument("--budget", type=int, default=160, help="Terse mode character budget")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    agent = BlackjackDealer()
+    print(f"{args.hands} hands per mode, terse budget {args.budget} chars")
+    print(f"{'tool':<12} {'mode':<8} {'calls':>6} {'avg chars':>10} {'max chars':>10} {'avg us':>8} {'p99 us':>8}")
+    for mode in MODES:
+        agent.phrases = Phrasebook(mode, args.budget)
+        samples = play(agent, args.hands, args.seed)
+        for tool in TOOLS:
+            if not samples[tool]:
+                continue
+            chars = [c for c, _ in samples[tool]]
+            times = sorted(t * 1e6 for _, t in samples[tool])
+            p99 = times[max(0, int(len(times) * 0.99) - 1)]
+            print(f"{tool:<12} {mode:<8} {len(chars):>6} {statistics.mean(chars):>10.1f} {max(chars):>10} "
+                  f"{statistics.mean(times):>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Restart-under-load test for graceful drain and state handoff
+Starts the dealer, keeps worker threads playing hands over SWAIG, sends SIGTERM,
+starts a replacement as soon as the old process exits and keeps the load running.
+Reports drain time, restart time, retried and dropped requests, and restored seats.
+
+A request refused while no process is listening is retried for up to --retry-window
+seconds; it only counts as dropped if it never gets through, or if it fails mid-flight.
+
+Usage: python benchmarks/bench_restart.py [--port 5099] [--workers 8] [--before 5] [--after 5]
+"""
+
+import argparse
+import base64
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+USERNAME = "bench"
+PASSWORD = "bench"
+
+
+def start_server(port, state_dir, name):
+    env = dict(
+        os.environ,
+        SWML_DEV_USERNAME=USERNAME,
+        SWML_DEV_PASSWORD=PASSWORD,
+        BLACKJACK_HANDOFF_FILE=str(state_dir / "handoff.json"),
+        BLACKJACK_STATS_FILE=str(state_dir / "stats.json"),
+        BLACKJACK_CALL_RATE="1000",
+        BLACKJACK_CALL_BURST="1000"
+    )
+    return subprocess.Popen(
+        [sys.executable, str(ROOT / "bot" / "sigmond_blackjack.py"), "--port", str(port)],
+        env=env, stdout=open(state_dir / f"{name}.log", "w"), stderr=subprocess.STDOUT
+    )
+
+
+def wait_healthy(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    return False
+
+
+class Worker(threading.Thread):
+    """One caller playing bet / new_hand in a loop, carrying global_data like SignalWire does"""
+
+    def __init__(self, port, stop, retry_window):
+        super().__init__(daemon=True)
+        self.url = f"http://127.0.0.1:{port}/swml/swaig"
+        self.auth = "Basic " + base64.b64encode(f"{USERNAME}:{PASSWORD}".encode()).decode()
+        self.stop = stop
+        self.retry_window = retry_window
+        self.results = {"ok": 0, "retried": 0, "dropped": 0, "latencies": []}
+        self.call_id = str(uuid.uuid4())
+        self.global_data = {"current_chips": 1000}
+
+    def call(self, function, args):
+        body = json.dumps({
+            "function": function,
+            "argument": {"parsed": [args], "raw": json.dumps(args)},
+            "call_id": self.call_id,
+            "global_data": self.global_data
+        }).encode()
+        request = urllib.request.Request(self.url, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            "Authorization": self.auth
+        })
+
+        start = time.monotonic()
+        retried = False
+        while True:
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    result = json.loads(response.read())
+                break
+            except urllib.error.HTTPError as e:
+                if e.code != 503 or time.monotonic() - start > self.retry_window:
+                    self.results["dropped"] += 1
+                    return
+            except urllib.error.URLError as e:
+                # Nothing listening - the old process is gone and the new one isn't up yet
+                if not isinstance(e.reason, ConnectionRefusedError) or time.monotonic() - start > self.retry_window:
+                    self.results["dropped"] += 1
+                    return
+            except ConnectionError:
+                # Connection reset with the request in flight
+                self.results["dropped"] += 1
+                return
+            retried = True
+            time.sleep(0.05)
+
+        self.results["latencies"].append(time.monotonic() - start)
+        self.results["ok"] += 1
+        self.results["retried"] += retried
+        for action in result.get("action", []):
+            if "set_global_data" in action:
+                self.global_data = action["set_global_data"]
+
+    def run(self):
+        while not self.stop.is_set():
+            self.call("place_bet", {"amount": 10})
+            self.call("stand", {})
+            self.call("new_hand", {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Restart the dealer under load")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--before", type=float, default=5.0, help="Seconds of load before SIGTERM")
+    parser.add_argument("--after", type=float, default=5.0, help="Seconds of load after the restart")
+    parser.add_argument("--retry-window", type=float, default=15.0)
+    args = parser.parse_args()
+
+    state_dir = Path(tempfile.mkdtemp(prefix="blackjack-restart-"))
+    old = start_server(args.port, state_dir, "old")
+    if not wait_healthy(args.port):
+        old.kill()
+        sys.exit(f"Server did not become healthy:\n{(state_dir / 'old.log').read_text()}")
+
+    stop = threading.Event()
+    workers = [Worker(args.port, stop, args.retry_window) for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    time.sleep(args.before)
+
+    terminated = time.monotonic()
+    old.send_signal(signal.SIGTERM)
+    old.wait()
+    exited = time.monotonic()
+    new = start_server(args.port, state_dir, "new")
+    healthy = wait_healthy(args.port)
+    ready = time.monotonic()
+
+    time.sleep(args.after)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    new.send_signal(signal.SIGTERM)
+    new.wait()
+
+    results = {key: sum(worker.results[key] for worker in workers) for key in ("ok", "retried", "dropped")}
+    latencies = sorted(latency for worker in workers for latency in worker.results["latencies"])
+    print(f"Drain (SIGTERM -> old process exit): {(exited - terminated) * 1000:.0f} ms")
+    print(f"Restart (SIGTERM -> new process healthy): {(ready - terminated) * 1000:.0f} ms" + ("" if healthy else " (never healthy)"))
+    print(f"Requests: {results['ok']} ok, {results['retried']} retried across the restart, {results['dropped']} dropped")
+    if latencies:
+        print(f"Latency: p50 {statistics.median(latencies) * 1000:.1f} ms, "
+              f"p99 {latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000:.1f} ms, max {latencies[-1] * 1000:.0f} ms")
+    logs = (state_dir / "old.log").read_text() + (state_dir / "new.log").read_text()
+    for line in logs.splitlines():
+        if line.startswith(("Drained", "Saved", "Restored")):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the dealer entry point
+Spawns fresh interpreters and times each startup phase: module import, BlackjackDealer(),
+get_app() and warm_up(). With --importtime it also lists the slowest imports.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--importtime] [--output startup.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BOT_DIR = Path(__file__).resolve().parent.parent / "bot"
+
+CHILD = f"""
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {str(BOT_DIR)!r})
+import sigmond_blackjack
+t1 = time.perf_counter()
+agent = sigmond_blackjack.BlackjackDealer()
+t2 = time.perf_counter()
+agent.get_app()
+t3 = time.perf_counter()
+agent.warm_up()
+t4 = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (t1 - t0) * 1000,
+    "construct_ms": (t2 - t1) * 1000,
+    "get_app_ms": (t3 - t2) * 1000,
+    "warm_up_ms": (t4 - t3) * 1000,
+    "ready_ms": (t4 - t0) * 1000
+}}))
+"""
+
+PHASES = ["import_ms", "construct_ms", "get_app_ms", "warm_up_ms", "ready_ms", "process_ms"]
+
+
+def run_once(importtime):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", CHILD]
+
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=BOT_DIR)
+    elapsed = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        sys.exit(f"Startup failed:\n{proc.stderr}")
+
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = elapsed
+    return timings, proc.stderr
+
+
+def slowest_imports(stderr, limit):
+    """Parse -X importtime output into (cumulative_us, module) pairs"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dealer cold-start time")
+    parser.add_argument("--runs", "-n", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true", help="Profile imports with -X importtime")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--output", "-o", type=Path, help="Write the medians as JSON to track over time")
+    args = parser.parse_args()
+
+    runs = []
+    stderr = ""
+    for _ in range(args.runs):
+        timings, stderr = run_once(args.importtime)
+        runs.append(timings)
+
+    medians = {phase: round(statistics.median(run[phase] for run in runs), 2) for phase in PHASES}
+    print(f"Cold start over {args.runs} runs (median):")
+    for phase in PHASES:
+        print(f"  {phase:<14} {medians[phase]:>9.1f} ms")
+
+    if args.importtime:
+        print("\nSlowest imports (cumulative, last run):")
+        for cumulative_us, name in slowest_imports(stderr, args.top):
+            print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    if args.output:
+        args.output.write_text(json.dumps({"runs": args.runs, "median": medians}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
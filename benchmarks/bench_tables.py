@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tables-per-process benchmark for the table engine, on the real tool handlers
+Every table gets a few seats; every seat plays hands through BlackjackDealer.on_function_call,
+routed by TableEngine.submit exactly like /swml/swaig does, carrying global_data between calls.
+The same load is also run with the handlers called directly, so the difference is the engine's cost.
+
+The handlers are synchronous and share one event loop, so tables never run in parallel:
+throughput stays flat as tables grow, and latency grows with the calls queued across the loop.
+
+Usage: python benchmarks/bench_tables.py [--tables 1 10 100 1000] [--seats 3] [--hands 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "bot"))
+
+# No recording, stats snapshots or handoff file from a benchmark dealer
+os.environ["BLACKJACK_RECORD_FILE"] = ""
+os.environ["BLACKJACK_STATS_FILE"] = ""
+os.environ["BLACKJACK_HANDOFF_FILE"] = ""
+
+from sigmond_blackjack import BlackjackDealer
+from table_engine import TableEngine
+from table_state import new_deck
+
+
+def saved_global_data(result, global_data):
+    """Pull the set_global_data action back out of a tool result, as SignalWire would"""
+    for action in result.to_dict().get("action", []):
+        if "set_global_data" in action:
+            return action["set_global_data"]
+    return global_data
+
+
+async def seat_loop(dealer, call_id, hands, routed, latencies):
+    """One caller: bet, hit below 17, stand, new hand"""
+    global_data = {"current_chips": 1000}
+
+    async def call(tool, args=None):
+        nonlocal global_data
+        raw_data = {"call_id": call_id, "function": tool, "global_data": global_data}
+        start = time.perf_counter()
+        if routed:
+            result = await dealer.tables.submit(call_id, dealer.on_function_call, tool, args or {}, raw_data)
+        else:
+            result = dealer.on_function_call(tool, args or {}, raw_data)
+            await asyncio.sleep(0)
+        latencies.append(time.perf_counter() - start)
+        global_data = saved_global_data(result, global_data)
+        return global_data.get("game_state", {})
+
+    for _ in range(hands):
+        game_state = await call("place_bet", {"amount": 10})
+        while game_state.get("game_phase") == "playing":
+            game_state = await call("hit" if game_state["player_score"] < 17 else "stand")
+        game_state = await call("new_hand")
+        if game_state["player_chips"] < 100:
+            global_data["game_state"]["player_chips"] = 1000
+
+
+async def run(dealer, tables, seats, hands, routed):
+    dealer.tables = TableEngine(new_deck, rng=dealer.rng)
+    latencies = []
+    for t in range(tables):
+        for s in range(seats):
+            dealer.tables.seat(f"table-{t}", f"call-{t}-{s}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        seat_loop(dealer, call_id, hands, routed, latencies)
+        for call_id in list(dealer.tables.seating)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the table engine on the real tool handlers")
+    parser.add_argument("--tables", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--seats", type=int, default=3)
+    parser.add_argument("--hands", type=int, default=5, help="Hands per seat")
+    args = parser.parse_args()
+
+    dealer = BlackjackDealer()
+    print(f"{args.seats} seats/table, {args.hands} hands/seat")
+    print(f"{'tables':>7} {'route':>7} {'calls':>8} {'seconds':>8} {'calls/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for tables in args.tables:
+        for routed in (False, True):
+            dealer.rng.seed(tables)
+            result = asyncio.run(run(dealer, tables, args.seats, args.hands, routed))
+            print(f"{tables:>7} {'actors' if routed else 'direct':>7} {result['calls']:>8} {result['elapsed']:>8.2f} "
+                  f"{result['throughput']:>10.0f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Admission control for the SWML and SWAIG endpoints
+Per-call token buckets plus a global concurrency limit with a bounded wait queue
+"""
+
+import asyncio
+import json
+import os
+import time
+
+# Spoken back to the player when a tool call is shed, so the AI simply retries
+OVERLOAD_MESSAGE = "One moment please, the dealer is busy with the table. Ask me again in a second."
+
+
+class TableLimits:
+    """Token bucket settings for the calls seated at one table"""
+
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, rate=1.0, burst=4):
+        self.rate = float(rate)
+        self.burst = float(burst)
+
+    def to_dict(self):
+        return {"rate": self.rate, "burst": self.burst}
+
+
+class TokenBucket:
+    """Classic token bucket - refills at `rate` tokens/second up to `burst`"""
+
+    __slots__ = ("limits", "tokens", "updated")
+
+    def __init__(self, limits, now):
+        self.limits = limits
+        self.tokens = limits.burst
+        self.updated = now
+
+    def take(self, now):
+        """Take one token if available"""
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.limits.burst, self.tokens + elapsed * self.limits.rate)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class AdmissionController:
+    """Decides whether a request runs now, waits in the queue, or is shed"""
+
+    def __init__(self, max_concurrent=32, max_queue=64, queue_timeout=2.0,
+                 default_limits=None, table_limits=None, idle_ttl=600):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.default_limits = default_limits or TableLimits()
+        self.table_limits = table_limits or {}
+        self.idle_ttl = idle_ttl
+
+        self._buckets = {}
+        self._last_prune = time.monotonic()
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.waiting = 0
+
+        self.counters = {
+            "admitted": 0,
+            "queued": 0,
+            "shed_rate_limited": 0,
+            "shed_queue_full": 0,
+            "shed_timeout": 0,
+            "peak_active": 0,
+            "peak_waiting": 0
+        }
+
+    @classmethod
+    def from_env(cls):
+        """Build a controller from BLACKJACK_* environment variables"""
+        table_limits = {
+            table_id: TableLimits(**limits)
+            for table_id, limits in json.loads(os.environ.get("BLACKJACK_TABLE_LIMITS", "{}")).items()
+        }
+        return cls(
+            max_concurrent=int(os.environ.get("BLACKJACK_MAX_CONCURRENT", 32)),
+            max_queue=int(os.environ.get("BLACKJACK_MAX_QUEUE", 64)),
+            queue_timeout=float(os.environ.get("BLACKJACK_QUEUE_TIMEOUT", 2.0)),
+            default_limits=TableLimits(
+                rate=float(os.environ.get("BLACKJACK_CALL_RATE", 1.0)),
+                burst=float(os.environ.get("BLACKJACK_CALL_BURST", 4))
+            ),
+            table_limits=table_limits
+        )
+
+    def set_table_limits(self, table_id, rate, burst):
+        """Override the per-call limits for every call at a table"""
+        self.table_limits[table_id] = TableLimits(rate, burst)
+
+    def limits_for(self, table_id):
+        return self.table_limits.get(table_id, self.default_limits)
+
+    def allow(self, call_id, table_id=None):
+        """Per-call rate limit - returns False if this call is over its budget"""
+        now = time.monotonic()
+        if now - self._last_prune > self.idle_ttl:
+            self._prune(now)
+
+        limits = self.limits_for(table_id or call_id)
+        bucket = self._buckets.get(call_id)
+        if bucket is None or bucket.limits is not limits:
+            bucket = self._buckets[call_id] = TokenBucket(limits, now)
+
+        if bucket.take(now):
+            return True
+        self.counters["shed_rate_limited"] += 1
+        return False
+
+    async def acquire(self):
+        """Take a worker slot, queueing up to queue_timeout - returns False if shed"""
+        # A released slot belongs to the waiter it woke until that waiter resumes,
+        # so count waiters too - anything that can't take a slot right now queues
+        if self.active + self.waiting >= self.max_concurrent or self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.counters["shed_queue_full"] += 1
+                return False
+            self.counters["queued"] += 1
+            self.waiting += 1
+            self.counters["peak_waiting"] = max(self.counters["peak_waiting"], self.waiting)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.counters["shed_timeout"] += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()  # not locked, so this returns without waiting
+
+        self.active += 1
+        self.counters["admitted"] += 1
+        self.counters["peak_active"] = max(self.counters["peak_active"], self.active)
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def _prune(self, now):
+        """Forget buckets for calls that have gone quiet"""
+        self._last_prune = now
+        stale = [call_id for call_id, bucket in self._buckets.items() if now - bucket.updated > self.idle_ttl]
+        for call_id in stale:
+            del self._buckets[call_id]
+
+    def stats(self):
+        """Current load and shed/queued counters"""
+        return {
+            **self.counters,
+            "active": self.active,
+            "waiting": self.waiting,
+            "tracked_calls": len(self._buckets),
+            "limits": {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+                "default": self.default_limits.to_dict(),
+                "tables": {table_id: limits.to_dict() for table_id, limits in self.table_limits.items()}
+            }
+        }
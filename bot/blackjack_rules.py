@@ -0,0 +1,76 @@
+"""
+Blackjack rules - deck, hand scoring and settlement
+Plain functions over the wire card dicts, shared by the dealer and the analytics tools
+"""
+
+SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace']
+
+# Packed card codes: suit index * 13 + rank index, so 0-51 covers the deck
+CARD_CODES = {(rank, suit): s * 13 + r for s, suit in enumerate(SUITS) for r, rank in enumerate(RANKS)}
+
+RESULT_BUST = "You bust. House wins."
+RESULT_DEALER_BUST = "I bust! You win!"
+RESULT_WIN = "You win!"
+RESULT_LOSS = "House wins."
+RESULT_PUSH = "Push. We tied."
+RESULT_BLACKJACK = "Blackjack pays three to two!"
+
+RESULTS = [RESULT_BUST, RESULT_DEALER_BUST, RESULT_WIN, RESULT_LOSS, RESULT_PUSH, RESULT_BLACKJACK]
+
+
+def card_value(rank):
+    return 10 if rank in ['jack', 'queen', 'king'] else 11 if rank == 'ace' else int(rank)
+
+
+def create_deck():
+    """Create a standard 52-card deck"""
+    deck = []
+    for suit in SUITS:
+        for rank in RANKS:
+            deck.append({
+                'rank': rank,
+                'suit': suit,
+                'value': card_value(rank),
+                'image': f"{rank}_of_{suit}.png"
+            })
+    return deck
+
+
+def calculate_score(hand):
+    """Calculate the score of a hand, handling aces appropriately"""
+    score = sum(card['value'] for card in hand)
+    aces = sum(1 for card in hand if card['rank'] == 'ace')
+
+    # Adjust for aces
+    while score > 21 and aces > 0:
+        score -= 10
+        aces -= 1
+
+    return score
+
+
+def settle(player_score, dealer_score, player_cards, bet):
+    """Decide the hand - returns (result text, chips paid back to the player including the bet)"""
+    if player_score > 21:
+        result_text = RESULT_BUST
+        winnings = 0
+    elif dealer_score > 21:
+        result_text = RESULT_DEALER_BUST
+        winnings = bet * 2
+    elif player_score > dealer_score:
+        result_text = RESULT_WIN
+        winnings = bet * 2
+    elif dealer_score > player_score:
+        result_text = RESULT_LOSS
+        winnings = 0
+    else:
+        result_text = RESULT_PUSH
+        winnings = bet  # Return the bet
+
+    # Check for blackjack bonus
+    if player_score == 21 and player_cards == 2 and dealer_score != 21:
+        result_text = RESULT_BLACKJACK
+        winnings = int(bet * 2.5)
+
+    return result_text, winnings
@@ -87,11 +87,11 @@ stop_dealer() {
     PID=$(cat "$PID_FILE")
     echo -e "${GREEN}Stopping Blackjack Dealer (PID: $PID)...${NC}"
     
-    # Send SIGTERM for graceful shutdown
+    # Send SIGTERM for graceful shutdown (drains in-flight requests, saves table state)
     kill -TERM "$PID" 2>/dev/null
     
-    # Wait up to 5 seconds for process to stop
-    for i in {1..5}; do
+    # Wait up to 10 seconds for process to stop (BLACKJACK_DRAIN_TIMEOUT defaults to 8)
+    for i in {1..10}; do
         if ! ps -p "$PID" > /dev/null 2>&1; then
             break
         fi
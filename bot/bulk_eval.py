@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Bulk hand evaluation - scores and settles whole batches of hands with NumPy
+Hands are rows of packed card codes (see blackjack_rules.CARD_CODES) padded with NO_CARD,
+so a batch of a million hands is one small uint8 array and one pass per rule.
+
+Usage:
+    python bulk_eval.py sessions.jsonl.gz [more.jsonl.gz ...]    # audit recorded hands
+    python bulk_eval.py sessions.jsonl.gz --csv hands.csv         # plus one row per hand
+    python bulk_eval.py --verify 100000                           # check against the scalar rules
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from collections import Counter, namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from blackjack_rules import CARD_CODES, RESULTS, create_deck, calculate_score, settle
+
+NO_CARD = 255
+
+# Code -> card dict, in the same order as the deck (suit-major), so DECK[code] decodes a code
+DECK = create_deck()
+
+HandEvaluation = namedtuple("HandEvaluation", "score soft bust blackjack cards")
+Settlement = namedtuple("Settlement", "player dealer outcome winnings")
+
+if np is not None:
+    # Lookup tables indexed by code - NO_CARD maps to zero everywhere
+    CARD_VALUES = np.zeros(256, dtype=np.int16)
+    CARD_ACES = np.zeros(256, dtype=np.int16)
+    for code, card in enumerate(DECK):
+        CARD_VALUES[code] = card['value']
+        CARD_ACES[code] = card['rank'] == 'ace'
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("bulk hand evaluation needs NumPy - pip install numpy")
+
+
+def encode_card(card):
+    """Packed code for a wire card dict"""
+    return CARD_CODES[(card['rank'], card['suit'])]
+
+
+def pack_hands(hands, width=None):
+    """Pack a list of hands (lists of card dicts) into a (hands, width) uint8 array"""
+    _require_numpy()
+    width = width or max((len(hand) for hand in hands), default=0)
+    codes = np.full((len(hands), width), NO_CARD, dtype=np.uint8)
+    for row, hand in enumerate(hands):
+        codes[row, :len(hand)] = [encode_card(card) for card in hand]
+    return codes
+
+
+def evaluate(codes):
+    """Score every hand in a packed batch - same totals as calculate_score, plus soft/bust/blackjack flags"""
+    _require_numpy()
+    codes = np.asarray(codes, dtype=np.uint8)
+    total = CARD_VALUES[codes].sum(axis=1)
+    aces = CARD_ACES[codes].sum(axis=1)
+    cards = (codes != NO_CARD).sum(axis=1)
+
+    # Count each ace as 1 instead of 11 until the hand is 21 or under, or the aces run out
+    demoted = np.minimum(aces, (np.maximum(total - 21, 0) + 9) // 10)
+    score = total - 10 * demoted
+    return HandEvaluation(
+        score=score,
+        soft=aces > demoted,
+        bust=score > 21,
+        blackjack=(score == 21) & (cards == 2),
+        cards=cards
+    )
+
+
+def settle_batch(player_codes, dealer_codes, bets):
+    """Settle a batch of finished hands - outcome indexes RESULTS, winnings match settle()"""
+    _require_numpy()
+    player = evaluate(player_codes)
+    dealer = evaluate(dealer_codes)
+    bets = np.asarray(bets, dtype=np.int64)
+
+    # Same precedence as settle(): player bust, dealer bust, higher score, push
+    rules = [
+        player.bust,
+        dealer.bust,
+        player.score > dealer.score,
+        dealer.score > player.score
+    ]
+    outcome = np.select(rules, [0, 1, 2, 3], default=4).astype(np.int8)
+    winnings = np.select(rules, [0, bets * 2, bets * 2, 0], default=bets)
+
+    bonus = player.blackjack & (dealer.score != 21)
+    outcome[bonus] = 5
+    winnings = np.where(bonus, bets * 5 // 2, winnings)
+    return Settlement(player=player, dealer=dealer, outcome=outcome, winnings=winnings)
+
+
+def _events(value, event_type):
+    """Every user event of a type anywhere inside a recorded response"""
+    if isinstance(value, dict):
+        if value.get("type") == event_type:
+            yield value
+        for item in value.values():
+            yield from _events(item, event_type)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _events(item, event_type)
+
+
+def resolved_hands(paths):
+    """(game state, hand_resolved event) for every hand settled in the recordings"""
+    from session_recorder import read_recording
+
+    for path in paths:
+        for entry in read_recording(path):
+            if entry["kind"] != "swaig":
+                continue
+            response = entry["response"]
+            resolved = next(_events(response, "hand_resolved"), None)
+            if resolved is None:
+                continue
+            for action in response.get("action", []):
+                game_state = (action.get("set_global_data") or {}).get("game_state")
+                if game_state:
+                    yield game_state, resolved
+                    break
+
+
+def audit(paths, csv_path=None, show_mismatches=5):
+    """Re-settle every recorded hand in one batch and compare with what the dealer paid"""
+    _require_numpy()
+    states, events = [], []
+    for game_state, resolved in resolved_hands(paths):
+        states.append(game_state)
+        events.append(resolved)
+    if not states:
+        print("No resolved hands in the recordings")
+        return 0
+
+    player_codes = pack_hands([state["player_hand"] for state in states])
+    dealer_codes = pack_hands([state["dealer_hand"] for state in states])
+    bets = np.array([state["current_bet"] for state in states], dtype=np.int64)
+
+    start = time.perf_counter()
+    settled = settle_batch(player_codes, dealer_codes, bets)
+    elapsed = time.perf_counter() - start
+
+    recorded = np.array([event["winnings"] for event in events], dtype=np.int64)
+    recorded_outcome = np.array([RESULTS.index(event["result"]) for event in events], dtype=np.int8)
+    mismatched = np.flatnonzero((recorded != settled.winnings) | (recorded_outcome != settled.outcome))
+
+    hands = len(states)
+    wagered = int(bets.sum())
+    paid = int(settled.winnings.sum())
+    print(f"Settled {hands} recorded hands in {elapsed * 1000:.2f} ms")
+    print(f"Wagered {wagered}, paid back {paid}, house net {wagered - paid} "
+          f"({(wagered - paid) / wagered * 100 if wagered else 0:.2f}% of action)")
+    print(f"Player blackjacks {int(settled.player.blackjack.sum())}, busts {int(settled.player.bust.sum())}, "
+          f"soft finishes {int(settled.player.soft.sum())}; dealer busts {int(settled.dealer.bust.sum())}")
+    for index, count in sorted(Counter(settled.outcome.tolist()).items()):
+        print(f"  {RESULTS[index]:<30} {count:>8} {count / hands * 100:6.2f}%")
+
+    for row in mismatched[:show_mismatches]:
+        print(f"Mismatch: recorded {events[row]['result']!r} paying {events[row]['winnings']}, "
+              f"rules say {RESULTS[settled.outcome[row]]!r} paying {int(settled.winnings[row])}")
+    print(f"Payouts matching the rules: {hands - len(mismatched)}/{hands}")
+
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["player_score", "player_soft", "dealer_score", "bet", "outcome", "winnings", "recorded_winnings"])
+            for row in range(hands):
+                writer.writerow([
+                    int(settled.player.score[row]), bool(settled.player.soft[row]), int(settled.dealer.score[row]),
+                    int(bets[row]), RESULTS[settled.outcome[row]], int(settled.winnings[row]), int(recorded[row])
+                ])
+    return len(mismatched)
+
+
+def verify(count, seed=0):
+    """Evaluate random hands both ways - the batch must agree with calculate_score and settle"""
+    _require_numpy()
+    rng = random.Random(seed)
+    player_hands = [[DECK[rng.randrange(52)] for _ in range(rng.randint(2, 7))] for _ in range(count)]
+    dealer_hands = [[DECK[rng.randrange(52)] for _ in range(rng.randint(2, 7))] for _ in range(count)]
+    bets = [rng.randrange(10, 1000) for _ in range(count)]
+    player_codes = pack_hands(player_hands)
+    dealer_codes = pack_hands(dealer_hands)
+
+    start = time.perf_counter()
+    scalar = []
+    for player_hand, dealer_hand, bet in zip(player_hands, dealer_hands, bets):
+        player_score = calculate_score(player_hand)
+        dealer_score = calculate_score(dealer_hand)
+        scalar.append((player_score, dealer_score) + settle(player_score, dealer_score, len(player_hand), bet))
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    settled = settle_batch(player_codes, dealer_codes, bets)
+    batch_seconds = time.perf_counter() - start
+
+    failures = 0
+    for row, (player_score, dealer_score, result_text, winnings) in enumerate(scalar):
+        # Soft: an ace still counts 11, i.e. the all-aces-as-one total is 10 lower
+        hard = sum(1 if card['rank'] == 'ace' else card['value'] for card in player_hands[row])
+        expected = (player_score, hard + 10 == player_score, dealer_score, result_text, winnings)
+        actual = (
+            int(settled.player.score[row]), bool(settled.player.soft[row]), int(settled.dealer.score[row]),
+            RESULTS[settled.outcome[row]], int(settled.winnings[row])
+        )
+        if actual != expected:
+            failures += 1
+            if failures <= 5:
+                print(f"Mismatch on hand {row}: scalar {expected}, batch {actual}")
+
+    print(f"Verified {count} hands: {count - failures} agree with calculate_score/settle")
+    print(f"Scalar {scalar_seconds * 1000:.1f} ms, batch {batch_seconds * 1000:.1f} ms "
+          f"({scalar_seconds / batch_seconds:.0f}x)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score and settle recorded blackjack hands in bulk")
+    parser.add_argument("recordings", nargs="*", help="gzipped JSON-lines logs written with BLACKJACK_RECORD_FILE")
+    parser.add_argument("--csv", help="Write one row per resolved hand to this file")
+    parser.add_argument("--verify", type=int, metavar="N", help="Check N random hands against the scalar rules")
+    args = parser.parse_args()
+    if not args.recordings and not args.verify:
+        parser.error("give recordings to audit, --verify N, or both")
+
+    try:
+        failures = verify(args.verify) if args.verify else 0
+        if args.recordings:
+            failures += audit(args.recordings, args.csv)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Graceful drain for zero-downtime restarts
+On SIGTERM stop taking new calls, let in-flight SWAIG requests finish, then shut down
+"""
+
+import signal
+import time
+
+import uvicorn
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that drains the agent before exiting on SIGTERM"""
+
+    def __init__(self, config, agent, drain_timeout=8.0):
+        super().__init__(config)
+        self.agent = agent
+        self.drain_timeout = drain_timeout
+        self.drain_started = None
+
+    def handle_exit(self, sig, frame):
+        # A second signal, or Ctrl+C, skips the drain
+        if sig != signal.SIGTERM or self.drain_started is not None:
+            return super().handle_exit(sig, frame)
+        self.drain_started = time.monotonic()
+        self.agent.start_draining()
+
+    async def on_tick(self, counter):
+        if self.drain_started is not None and not self.should_exit:
+            waited = time.monotonic() - self.drain_started
+            if self.agent.in_flight() == 0 or waited > self.drain_timeout:
+                print(f"Drained in {waited:.2f}s with {self.agent.in_flight()} requests still in flight")
+                self.should_exit = True
+        return await super().on_tick(counter)
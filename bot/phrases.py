@@ -0,0 +1,250 @@
+"""
+Dealer phrasebook - pre-rendered phrases for the tool responses the AI reads back
+"verbose" keeps the full narration, "terse" keeps responses under a character budget
+"""
+
+import os
+
+from blackjack_rules import (
+    SUITS, RANKS, RESULT_BUST, RESULT_DEALER_BUST, RESULT_WIN, RESULT_LOSS, RESULT_PUSH, RESULT_BLACKJACK
+)
+
+# Pre-rendered phrase table - every card name, total and outcome is built once at import
+CARD_NAMES = {
+    (rank, suit): f"{rank.capitalize()} of {suit.capitalize()}"
+    for suit in SUITS
+    for rank in RANKS
+}
+
+POINTS = {total: f"{total} points" for total in range(0, 41)}
+
+TERSE_OUTCOMES = {
+    RESULT_BUST: "You bust, house wins.",
+    RESULT_DEALER_BUST: "I bust, you win!",
+    RESULT_WIN: "You win!",
+    RESULT_LOSS: "House wins.",
+    RESULT_PUSH: "Push.",
+    RESULT_BLACKJACK: "Blackjack pays three to two!"
+}
+
+# Drop order when a terse response is over budget - ESSENTIAL parts are never dropped
+ESSENTIAL, USEFUL, DETAIL, FLAVOR = 0, 1, 2, 3
+
+MODES = ("verbose", "terse")
+
+
+def card_name(card):
+    """Get the display name of a card"""
+    return CARD_NAMES[(card['rank'], card['suit'])]
+
+
+def hand_names(hand):
+    return ", ".join([CARD_NAMES[(card['rank'], card['suit'])] for card in hand])
+
+
+class Speech:
+    """Collects the parts of one tool response, in order, with a drop priority each"""
+
+    __slots__ = ("parts", "budget", "separator")
+
+    def __init__(self, budget=None, separator=""):
+        self.parts = []
+        self.budget = budget
+        self.separator = separator
+
+    def add(self, text, priority=ESSENTIAL):
+        self.parts.append((text, priority))
+
+    def render(self):
+        """Join the parts, dropping the least important ones until the response fits the budget"""
+        parts = self.parts
+        text = self.separator.join(part for part, _ in parts)
+        if self.budget is None or len(text) <= self.budget:
+            return text
+        for priority in (FLAVOR, DETAIL, USEFUL):
+            parts = [(part, p) for part, p in parts if p < priority]
+            text = self.separator.join(part for part, _ in parts)
+            if len(text) <= self.budget:
+                break
+        return text
+
+
+class Phrasebook:
+    """Builds every dealer tool response in either verbose or terse mode"""
+
+    def __init__(self, mode="verbose", budget=160):
+        if mode not in MODES:
+            raise ValueError(f"Unknown response mode '{mode}' (expected one of: {', '.join(MODES)})")
+        self.mode = mode
+        self.budget = budget
+        self.terse = mode == "terse"
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            mode=os.environ.get("BLACKJACK_RESPONSE_MODE", "verbose"),
+            budget=int(os.environ.get("BLACKJACK_RESPONSE_BUDGET", 160))
+        )
+
+    def speech(self):
+        if self.terse:
+            return Speech(self.budget, " ")
+        return Speech()
+
+    # Betting and the deal
+
+    def bet_placed(self, speech, amount, chips):
+        if self.terse:
+            speech.add(f"Bet {amount}, {chips} left.", USEFUL)
+        else:
+            speech.add(f"Perfect! You've bet {amount} chips. You have {chips} chips remaining.\n\n")
+
+    def shuffled(self, speech):
+        if self.terse:
+            speech.add("Fresh deck.", FLAVOR)
+        else:
+            speech.add("Shuffling a fresh deck.\n\n")
+
+    def cards_dealt(self, speech, player_hand, player_score, dealer_up):
+        if self.terse:
+            speech.add(f"You have {hand_names(player_hand)}, {player_score}.")
+            speech.add(f"I show {card_name(dealer_up)}.")
+        else:
+            speech.add(f"Cards dealt! You have: {hand_names(player_hand)} for a total of {POINTS[player_score]}.\n")
+            speech.add(f"I'm showing {card_name(dealer_up)} with my other card face down.")
+
+    def blackjack(self, speech):
+        speech.add("Blackjack!" if self.terse else "\n\nBlackjack! Twenty-one!")
+
+    def hand_in_play(self, speech):
+        if self.terse:
+            speech.add("Hit or stand?", USEFUL)
+        else:
+            speech.add("\n\nThe hand is now in play. What would you like to do?")
+
+    # Player actions
+
+    def player_hit(self, speech, card, hand, score):
+        if self.terse:
+            speech.add(f"You draw {card_name(card)}, {score}.")
+            speech.add(f"Hand: {hand_names(hand)}.", DETAIL)
+        else:
+            speech.add(f"The player hits and receives: {card_name(card)}.\n")
+            speech.add(f"Player's complete hand: {hand_names(hand)}.\n")
+            speech.add(f"Player's total: {POINTS[score]}.")
+
+    def player_bust(self, speech):
+        speech.add("That's a bust." if self.terse else " That's a bust! You're over twenty-one.")
+
+    def twenty_one(self, speech):
+        speech.add("Twenty-one!" if self.terse else " Twenty-one! Perfect!")
+
+    def hand_continues(self, speech, score):
+        if self.terse:
+            speech.add("The hand continues.")
+        else:
+            speech.add(f"\n\nYou have {POINTS[score]}. The hand continues. What would you like to do?")
+
+    def player_stands(self, speech, score):
+        if self.terse:
+            speech.add(f"You stand on {score}.", USEFUL)
+        else:
+            speech.add(f"The player stands with {POINTS[score]}. Now it's the dealer's turn.\n")
+
+    def doubled_down(self, speech, bet, card, score, chips):
+        if self.terse:
+            speech.add(f"Doubled to {bet}. You draw {card_name(card)}, {score}.")
+            speech.add(f"{chips} left.", DETAIL)
+        else:
+            speech.add(f"The player doubles down! The bet is now doubled to {bet} chips.\n")
+            speech.add(f"Player receives one final card: {card_name(card)}.\n")
+            speech.add(f"Player's final total: {POINTS[score]}. Player has {chips} chips remaining.")
+
+    def double_bust(self, speech):
+        speech.add("That's a bust." if self.terse else " That's a bust!")
+
+    def pause(self, speech):
+        if not self.terse:
+            speech.add("\n\n")
+
+    # Dealer's turn
+
+    def dealer_reveals(self, speech, hand, score):
+        if self.terse:
+            speech.add(f"I have {hand_names(hand)}, {score}.", USEFUL)
+        else:
+            speech.add(f"\nDealer reveals hole card. Dealer's complete hand: {hand_names(hand)} for {POINTS[score]}.\n")
+
+    def dealer_draws(self, speech, card, score):
+        if self.terse:
+            speech.add(f"I draw {card_name(card)}, {score}.", DETAIL)
+        else:
+            speech.add(f"Dealer draws {card_name(card)}. Dealer now has {POINTS[score]}.\n")
+
+    def dealer_busts(self, speech):
+        if not self.terse:
+            speech.add("Dealer busts! Over 21!")
+
+    def dealer_stands(self, speech, score):
+        if not self.terse:
+            speech.add(f"Dealer stands with {POINTS[score]}.")
+
+    # Resolution
+
+    def resolution(self, speech, result_text, player_score, dealer_score, bet, winnings, chips):
+        if self.terse:
+            speech.add(f"{TERSE_OUTCOMES[result_text]} {player_score} to {dealer_score}.")
+            if winnings > bet:
+                speech.add(f"You win {winnings - bet}.", USEFUL)
+            elif winnings < bet:
+                speech.add(f"You lose {bet}.", USEFUL)
+            speech.add(f"{chips} chips.")
+            if chips < 10:
+                speech.add("You're out of chips. Game over.")
+            return
+
+        response = f"\n\nHand complete! {result_text}\n"
+        response += f"Player had {player_score}, Dealer had {dealer_score}.\n"
+        if winnings > bet:
+            response += f"Player wins {winnings - bet} chips! "
+        elif winnings == bet:
+            response += f"Player's bet of {bet} chips is returned. "
+        else:
+            response += f"Player loses their {bet} chip bet. "
+        response += f"Player now has {chips} chips total."
+
+        if chips < 10:
+            response += "\n\nYou're out of chips! Game over. Thanks for playing!"
+        speech.add(response)
+
+    def new_hand(self, speech, chips):
+        if self.terse:
+            speech.add(f"New hand. You have {chips} chips.")
+        else:
+            speech.add(f"Starting a new hand. You have {chips} chips.")
+
+
+class ResponseStats:
+    """Per-tool response length and generation time, split by response mode"""
+
+    def __init__(self):
+        self.tools = {}
+
+    def record(self, tool, mode, chars, seconds):
+        entry = self.tools.setdefault(f"{tool}:{mode}", [0, 0, 0, 0.0])
+        entry[0] += 1
+        entry[1] += chars
+        entry[2] = max(entry[2], chars)
+        entry[3] += seconds
+
+    def summary(self):
+        report = {}
+        for key, (calls, chars, max_chars, seconds) in sorted(self.tools.items()):
+            tool, mode = key.split(":")
+            report.setdefault(tool, {})[mode] = {
+                "calls": calls,
+                "avg_chars": round(chars / calls, 1),
+                "max_chars": max_chars,
+                "avg_ms": round(seconds / calls * 1000, 3)
+            }
+        return report
@@ -0,0 +1,294 @@
+"""
+Streaming player stats - live leaderboards from resolved hands in fixed memory
+Running moments for the whole casino, a space-saving top-k of the busiest players
+and a HyperLogLog sketch for the number of distinct players
+Players are keyed by pseudonym (see pseudonyms.py) - no caller number or name is kept or published
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import time
+from pathlib import Path
+
+from blackjack_rules import (
+    RESULT_BUST, RESULT_DEALER_BUST, RESULT_WIN, RESULT_LOSS, RESULT_PUSH, RESULT_BLACKJACK
+)
+
+OUTCOMES = {
+    RESULT_BUST: "bust",
+    RESULT_DEALER_BUST: "win",
+    RESULT_WIN: "win",
+    RESULT_LOSS: "loss",
+    RESULT_PUSH: "push",
+    RESULT_BLACKJACK: "blackjack"
+}
+
+# Version 1 snapshots keyed players by caller number and stored caller names
+SNAPSHOT_VERSION = 2
+
+
+class RunningMoments:
+    """Count, mean, variance, min and max of a stream (Welford's algorithm)"""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        moments = cls()
+        for name in cls.__slots__:
+            setattr(moments, name, data[name])
+        return moments
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 2),
+            "stddev": round(self.stddev, 2),
+            "min": self.min,
+            "max": self.max
+        }
+
+
+class HyperLogLog:
+    """Approximate distinct count in 2**precision bytes (~1.6% error at the default 4096 registers)"""
+
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, key):
+        value = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_dict(self):
+        return {"precision": self.precision, "registers": self.registers.hex()}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["precision"])
+        sketch.registers = bytearray.fromhex(data["registers"])
+        return sketch
+
+
+class PlayerEntry:
+    """Per-player counters for one slot of the space-saving table"""
+
+    __slots__ = ("player", "hands", "error", "wins", "pushes", "blackjacks",
+                 "net_chips", "biggest_win", "last_seen")
+
+    def __init__(self, player, hands=0, error=0):
+        self.player = player
+        self.hands = hands  # Space-saving count - may overcount by up to `error`
+        self.error = error
+        self.wins = 0
+        self.pushes = 0
+        self.blackjacks = 0
+        self.net_chips = 0
+        self.biggest_win = 0
+        self.last_seen = 0.0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        entry = cls(data["player"])
+        for name in cls.__slots__:
+            setattr(entry, name, data[name])
+        return entry
+
+    def summary(self):
+        hands = self.hands - self.error
+        return {
+            "player": self.player,
+            "hands_played": hands,
+            "hands_error": self.error,
+            "win_rate": round((self.wins + self.blackjacks) / hands, 3) if hands > 0 else None,
+            "blackjacks": self.blackjacks,
+            "pushes": self.pushes,
+            "biggest_win": self.biggest_win,
+            "net_chips": self.net_chips
+        }
+
+
+def write_snapshot(path, data):
+    """Write JSON atomically - readers see the old snapshot or the new one, never half of one"""
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+class PlayerStats:
+    """Fixed-size streaming aggregate of every resolved hand"""
+
+    def __init__(self, capacity=256, top_wins=10, precision=12):
+        self.capacity = capacity
+        self.top_wins_size = top_wins
+        self.started = time.time()
+        self.hands = 0
+        self.outcomes = {outcome: 0 for outcome in set(OUTCOMES.values())}
+        self.bets = RunningMoments()
+        self.net = RunningMoments()
+        self.players = {}       # Space-saving slots, at most `capacity`
+        self.biggest_wins = []  # Min-heap of (amount, time, player)
+        self.distinct = HyperLogLog(precision)
+
+    def record(self, player, bet, winnings, result_text):
+        """Feed one resolved hand - player is a pseudonym, never a caller number or name"""
+        outcome = OUTCOMES[result_text]
+        net = winnings - bet
+        now = time.time()
+
+        self.hands += 1
+        self.outcomes[outcome] += 1
+        self.bets.add(bet)
+        self.net.add(net)
+        self.distinct.add(player)
+
+        entry = self.players.get(player)
+        if entry is None:
+            entry = self._admit(player)
+        entry.hands += 1
+        entry.last_seen = now
+        entry.net_chips += net
+        if outcome == "win":
+            entry.wins += 1
+        elif outcome == "blackjack":
+            entry.blackjacks += 1
+        elif outcome == "push":
+            entry.pushes += 1
+
+        if net > 0:
+            entry.biggest_win = max(entry.biggest_win, net)
+            item = (net, now, player)
+            if len(self.biggest_wins) < self.top_wins_size:
+                heapq.heappush(self.biggest_wins, item)
+            elif item > self.biggest_wins[0]:
+                heapq.heapreplace(self.biggest_wins, item)
+
+    def _admit(self, player):
+        """Space-saving: when full, the new player takes over the least active slot"""
+        if len(self.players) < self.capacity:
+            entry = self.players[player] = PlayerEntry(player)
+            return entry
+        evicted = min(self.players.values(), key=lambda e: e.hands)
+        del self.players[evicted.player]
+        entry = self.players[player] = PlayerEntry(player, hands=evicted.hands, error=evicted.hands)
+        return entry
+
+    # Queries
+
+    def summary(self):
+        hands = self.hands
+        return {
+            "since": self.started,
+            "hands_played": hands,
+            "distinct_players": self.distinct.count(),
+            "outcomes": self.outcomes,
+            "house_edge": round(-self.net.mean / self.bets.mean, 4) if self.bets.mean else None,
+            "bet": self.bets.summary(),
+            "net_per_hand": self.net.summary(),
+            "tracked_players": len(self.players)
+        }
+
+    def leaderboard(self, by="net_chips", limit=10, min_hands=1):
+        if by not in ("net_chips", "hands_played", "win_rate", "biggest_win"):
+            raise ValueError(f"Can't rank players by '{by}'")
+        rows = [entry.summary() for entry in self.players.values()]
+        rows = [row for row in rows if row["hands_played"] >= min_hands]
+        rows.sort(key=lambda row: row[by] or 0, reverse=True)
+        return rows[:limit]
+
+    def player(self, player):
+        entry = self.players.get(player)
+        return entry.summary() if entry is not None else None
+
+    def top_wins(self):
+        return [
+            {"player": player, "amount": amount, "time": when}
+            for amount, when, player in sorted(self.biggest_wins, reverse=True)
+        ]
+
+    # Snapshots
+
+    def to_dict(self):
+        """Snapshot made only of copies, so it can be serialized off the event loop while hands keep landing"""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "capacity": self.capacity,
+            "started": self.started,
+            "hands": self.hands,
+            "outcomes": dict(self.outcomes),
+            "bets": self.bets.to_dict(),
+            "net": self.net.to_dict(),
+            "players": [entry.to_dict() for entry in self.players.values()],
+            "biggest_wins": list(self.biggest_wins),
+            "distinct": self.distinct.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data, top_wins=10):
+        stats = cls(capacity=data["capacity"], top_wins=top_wins, precision=data["distinct"]["precision"])
+        stats.started = data["started"]
+        stats.hands = data["hands"]
+        stats.outcomes.update(data["outcomes"])
+        stats.bets = RunningMoments.from_dict(data["bets"])
+        stats.net = RunningMoments.from_dict(data["net"])
+        stats.distinct = HyperLogLog.from_dict(data["distinct"])
+        if data.get("version") != SNAPSHOT_VERSION:
+            # Per-player rows from an older snapshot hold raw caller numbers and names - keep only the totals
+            return stats
+        stats.players = {entry["player"]: PlayerEntry.from_dict(entry) for entry in data["players"]}
+        stats.biggest_wins = [tuple(item) for item in data["biggest_wins"]]
+        heapq.heapify(stats.biggest_wins)
+        return stats
+
+    def save(self, path):
+        write_snapshot(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path):
+        """Load a snapshot, or start fresh if there isn't one"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls.from_dict(json.loads(path.read_text()))
@@ -0,0 +1,22 @@
+"""
+Keyed pseudonyms for caller identity
+A keyed hash can't be reversed by hashing every phone number, and stays stable for as long as the key does
+"""
+
+import hashlib
+import os
+import secrets
+
+
+def load_key():
+    """The pseudonym key from BLACKJACK_PSEUDONYM_KEY, or a random one that only lasts this process"""
+    secret = os.environ.get("BLACKJACK_PSEUDONYM_KEY")
+    if not secret:
+        print("BLACKJACK_PSEUDONYM_KEY is not set - player pseudonyms will change on restart")
+        return secrets.token_bytes(32)
+    return hashlib.blake2b(secret.encode("utf-8"), digest_size=32).digest()
+
+
+def pseudonym(value, key, prefix="player-"):
+    """Same value and key, same pseudonym"""
+    return prefix + hashlib.blake2b(str(value).encode("utf-8"), key=key, digest_size=8).hexdigest()
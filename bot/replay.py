@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded session log through the BlackjackDealer handlers
+Each recorded session is replayed on a fresh dealer seeded like the original, so every
+shuffle deals the same cards - the tool responses must then match the recording exactly.
+
+Usage:
+    BLACKJACK_RECORD_FILE=sessions.jsonl.gz python sigmond_blackjack.py   # record
+    python replay.py sessions.jsonl.gz                                  # full speed
+    python replay.py sessions.jsonl.gz --realtime --speed 4             # recorded pacing, 4x
+    python replay.py --self-check 300                                   # record 300 hands per mode, replay them
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from session_recorder import SessionRecorder, read_recording, redact
+import swaig_codec
+
+
+def new_dealer(header):
+    """A dealer set up like the recorded one, with recording, stats and handoff files off"""
+    os.environ["BLACKJACK_SEED"] = str(header["seed"])
+    os.environ["BLACKJACK_RECORD_FILE"] = ""
+    os.environ["BLACKJACK_STATS_FILE"] = ""
+    os.environ["BLACKJACK_HANDOFF_FILE"] = ""
+    settings = header.get("settings", {})
+    if "response_mode" in settings:
+        os.environ["BLACKJACK_RESPONSE_MODE"] = settings["response_mode"]
+        os.environ["BLACKJACK_RESPONSE_BUDGET"] = str(settings["response_budget"])
+
+    from sigmond_blackjack import BlackjackDealer
+    return BlackjackDealer()
+
+
+def play_hands(dealer, hands):
+    """Play hands through on_function_call like SignalWire would, carrying global_data between calls"""
+    global_data = {"current_chips": 1000}
+
+    def call(function, args=None):
+        nonlocal global_data
+        raw_data = {"call_id": "self-check", "caller_id_num": "+15550000000", "function": function, "global_data": global_data}
+        result = dealer.on_function_call(function, args or {}, raw_data)
+        for action in result.to_dict().get("action", []):
+            if "set_global_data" in action:
+                global_data = action["set_global_data"]
+        return global_data.get("game_state", {})
+
+    for _ in range(hands):
+        game_state = call("place_bet", {"amount": 50})
+        while game_state.get("game_phase") == "playing":
+            score = game_state["player_score"]
+            if score in (10, 11) and len(game_state["player_hand"]) == 2 and game_state["player_chips"] >= game_state["current_bet"]:
+                game_state = call("double_down")
+            else:
+                game_state = call("hit" if score < 17 else "stand")
+        game_state = call("new_hand")
+        if game_state["player_chips"] < 100:
+            global_data["game_state"]["player_chips"] = 1000
+
+
+def self_check(hands, seed=7):
+    """Record hands in each response mode, then replay the recording - every call must match"""
+    from phrases import MODES
+
+    path = Path(tempfile.mkdtemp(prefix="blackjack-replay-")) / "self_check.jsonl.gz"
+    for mode in MODES:
+        settings = {"response_mode": mode, "response_budget": 160}
+        dealer = new_dealer({"seed": seed, "settings": settings})
+        dealer.recorder = SessionRecorder(str(path), dealer.seed, dealer.player_key, **settings)
+        play_hands(dealer, hands)
+        dealer.recorder.close()
+    return replay(str(path))
+
+
+def percentile(values, fraction):
+    return values[max(0, int(len(values) * fraction) - 1)]
+
+
+def replay(path, realtime=False, speed=1.0, show_mismatches=3):
+    dealer = None
+    latencies = {}
+    calls = 0
+    mismatches = 0
+    busy = 0.0
+    wall_start = time.perf_counter()
+
+    for entry in read_recording(path):
+        kind = entry["kind"]
+        if kind == "header":
+            dealer = new_dealer(entry)
+            session_start = time.perf_counter()
+            continue
+
+        if realtime:
+            delay = entry["t"] / speed - (time.perf_counter() - session_start)
+            if delay > 0:
+                time.sleep(delay)
+
+        if kind == "swml":
+            request = entry["request"]
+            call_id = (request.get("call") or {}).get("call_id")
+            if entry.get("table") and call_id:
+                dealer.tables.seat(entry["table"], call_id)
+            continue
+
+        start = time.perf_counter()
+        result = dealer.on_function_call(entry["function"], entry["args"], entry["request"])
+        elapsed = time.perf_counter() - start
+        busy += elapsed
+        calls += 1
+        latencies.setdefault(entry["function"], []).append(elapsed)
+
+        actual = swaig_codec.loads(swaig_codec.dumps(redact(result.to_dict(), dealer.player_key)))
+        if actual != entry["response"]:
+            mismatches += 1
+            if mismatches <= show_mismatches:
+                print(f"Mismatch in {entry['function']} at t={entry['t']:.3f}s:")
+                print(f"  recorded: {entry['response'].get('response')!r}")
+                print(f"  replayed: {actual.get('response')!r}")
+
+    wall = time.perf_counter() - wall_start
+    print(f"Replayed {calls} tool calls in {wall:.2f}s ({'real-time x%g' % speed if realtime else 'full speed'})")
+    if calls:
+        print(f"Throughput: {calls / busy:.0f} calls/s in handlers, {calls / wall:.0f} calls/s wall")
+    print(f"{'function':<12} {'calls':>6} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for function, samples in sorted(latencies.items()):
+        samples.sort()
+        print(f"{function:<12} {len(samples):>6} {statistics.median(samples) * 1e6:>8.1f} "
+              f"{percentile(samples, 0.99) * 1e6:>8.1f} {samples[-1] * 1e6:>8.1f}")
+    print(f"Outputs matching the recording: {calls - mismatches}/{calls}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded blackjack session log")
+    parser.add_argument("recording", nargs="?", help="gzipped JSON-lines log written with BLACKJACK_RECORD_FILE")
+    parser.add_argument("--realtime", action="store_true", help="Pace calls as they were recorded")
+    parser.add_argument("--speed", type=float, default=1.0, help="Speed-up factor for --realtime")
+    parser.add_argument("--self-check", type=int, metavar="HANDS", help="Record HANDS hands per response mode and replay them")
+    args = parser.parse_args()
+    if not args.recording and not args.self_check:
+        parser.error("give a recording to replay, or --self-check HANDS")
+
+    if args.self_check:
+        mismatches = self_check(args.self_check)
+    else:
+        mismatches = replay(args.recording, args.realtime, args.speed)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
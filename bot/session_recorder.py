@@ -0,0 +1,96 @@
+"""
+Session recorder - logs SWML requests and SWAIG tool calls to a gzipped JSON-lines file
+Caller identity is replaced with stable keyed pseudonyms before anything is written
+"""
+
+import gzip
+import time
+
+from pseudonyms import pseudonym
+import swaig_codec
+
+FORMAT_VERSION = 1
+
+# Keys whose values identify the caller - replaced wherever they appear
+REDACTED_KEYS = {
+    "caller_id_name", "caller_id_num", "caller_id_number", "from", "to",
+    "from_number", "to_number", "meta_data_token", "project_id", "space_id",
+    "headers", "sip_headers"
+}
+
+
+def redact(value, key):
+    """Copy of a request/response with every REDACTED_KEYS value replaced by its keyed pseudonym"""
+    if isinstance(value, dict):
+        return {
+            name: pseudonym(item, key, "redacted-") if name in REDACTED_KEYS and item is not None else redact(item, key)
+            for name, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item, key) for item in value]
+    return value
+
+
+class SessionRecorder:
+    """Appends one compressed JSON line per request, after a header line with the RNG seed
+    Writes happen on the request path, so compression stays at a cheap level"""
+
+    def __init__(self, path, seed, key, flush_every=50, compresslevel=1, **settings):
+        self.path = path
+        self.key = key
+        self.started = time.monotonic()
+        self.flush_every = flush_every
+        self.entries = 0
+        self._file = gzip.open(path, "ab", compresslevel=compresslevel)
+        self._write({
+            "kind": "header",
+            "version": FORMAT_VERSION,
+            "seed": seed,
+            "started": time.time(),
+            "settings": settings
+        })
+
+    def _write(self, entry):
+        self._file.write(swaig_codec.dumps(entry) + b"\n")
+        self.entries += 1
+        if self.entries % self.flush_every == 0:
+            self._file.flush()
+
+    def record_swml(self, request_data, table_id=None):
+        self._write({
+            "kind": "swml",
+            "t": time.monotonic() - self.started,
+            "table": table_id,
+            "request": redact(request_data or {}, self.key)
+        })
+
+    def snapshot(self, raw_data):
+        """Redacted deep copy of a SWAIG request, taken before the handler changes it"""
+        return redact(raw_data or {}, self.key)
+
+    def record_swaig(self, name, args, request, response, seconds):
+        """Log a tool call - request is the snapshot() taken before the call"""
+        self._write({
+            "kind": "swaig",
+            "t": time.monotonic() - self.started,
+            "function": name,
+            "args": args,
+            "request": request,
+            "response": redact(response, self.key),
+            "ms": round(seconds * 1000, 3)
+        })
+
+    def close(self):
+        self._file.close()
+
+
+def read_recording(path):
+    """Yield the entries of a recording - a header line starts each recorded session"""
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield swaig_codec.loads(line)
+        except EOFError:
+            # The last session ended without closing the file - keep what was flushed
+            return
@@ -5,16 +5,127 @@ An AI-powered blackjack dealer that plays casino-style blackjack via voice/video
 Uses stateless architecture with centralized state management
 """
 
-import json
+import asyncio
+import base64
+import hmac
 import random
 import argparse
 import os
-import mimetypes
+import time
+import traceback
+from collections import namedtuple
+from contextlib import asynccontextmanager
 from pathlib import Path
 from signalwire_agents import AgentBase
 from signalwire_agents.core.function_result import SwaigFunctionResult
-from signalwire_agents.web.web_service import WebService
 from fastapi import Request, Response
+import swaig_codec
+from admission import AdmissionController, OVERLOAD_MESSAGE
+from table_engine import TableEngine
+from blackjack_rules import settle
+from phrases import Phrasebook, ResponseStats
+from player_stats import PlayerStats, write_snapshot
+from pseudonyms import load_key, pseudonym
+from session_recorder import SessionRecorder
+from table_state import CARDS, TableState, hand_score, new_deck
+
+
+class CodecRequest(Request):
+    """Request whose json() goes through the pluggable SWAIG codec"""
+    
+    async def json(self):
+        if not hasattr(self, "_json"):
+            # The admission middleware already decoded the body - reuse that instead of parsing twice
+            parsed = getattr(self.state, "parsed_body", None)
+            self._json = parsed if parsed is not None else swaig_codec.loads(await self.body())
+        return self._json
+
+
+# Prompt and conversation steps - built once at import and shared (read-only) by every dealer
+DEALER_PERSONALITY = (
+    "You are a professional blackjack dealer at a high-end casino. You're friendly but professional, "
+    "explaining the rules clearly and maintaining the excitement of the game. You follow standard "
+    "casino blackjack rules: dealer hits on 16 and below, stands on 17 and above."
+)
+
+DEALER_GOAL = "Run an engaging blackjack game, manage bets, deal cards, and ensure fair play according to casino rules."
+
+StepSpec = namedtuple("StepSpec", "name task bullets_title bullets criteria functions valid_steps")
+
+DEALER_STEPS = (
+    # Betting phase - this is the starting point
+    StepSpec(
+        name="betting",
+        task="Take the player's bet",
+        bullets_title="Betting Process",
+        bullets=(
+            "The player has ${global_data.current_chips} chips",
+            "Ask how much they'd like to bet (minimum 10, maximum ${global_data.current_chips})",
+            "When they tell you an amount, call place_bet function with that amount",
+        ),
+        criteria="A valid bet has been placed and cards have been dealt",
+        functions=("place_bet",),
+        valid_steps=("playing",)
+    ),
+    # Playing phase
+    StepSpec(
+        name="playing",
+        task="Manage the active blackjack hand",
+        bullets_title="CRITICAL RULES - YOU MUST FOLLOW THESE",
+        bullets=(
+            "The player currently has ${global_data.game_state.player_score} points",
+            "When player says 'hit' or wants another card: YOU MUST CALL THE hit FUNCTION",
+            "When player says 'stand' or wants to stay: YOU MUST CALL THE stand FUNCTION", 
+            "When player says 'double down': YOU MUST CALL THE double_down FUNCTION",
+            "Split is NOT available at this table - do not offer it as an option",
+            "NEVER make up cards or scores - ONLY use what the functions return",
+            "NEVER deal cards yourself - the hit function deals cards",
+            "NEVER calculate scores yourself - the functions calculate scores",
+            "The hit function will tell you EXACTLY what card was drawn and the new score",
+            "If the function says 'the hand continues', keep playing - player has NOT busted",
+            "Only say the player busted if the function explicitly says 'bust'"
+        ),
+        criteria="Hand is complete and the winner is determined.",
+        functions=("hit", "stand", "double_down"),
+        valid_steps=("hand_complete", "game_over")
+    ),
+    # Post-Game phase
+    StepSpec(
+        name="hand_complete",
+        task="The hand is complete. Review the results and wait for player's decision.",
+        bullets_title="Important Instructions",
+        bullets=(
+            "The cards are still on the table - explain what happened in this hand",
+            "Tell the user their chip count and how much they won or lost",
+            "Ask if they want to play another hand",
+            "DO NOT take any bets or start a new game until you call new_hand",
+            "If the user wants to play again, you MUST call new_hand first",
+            "The new_hand function will reset the table and change to betting step",
+            "Only after calling new_hand can you take a new bet"
+        ),
+        criteria="User has indicated whether they want to play another hand",
+        functions=("new_hand",),
+        valid_steps=("betting",)
+    ),
+    # Game Over phase - when player runs out of chips
+    StepSpec(
+        name="game_over",
+        task="The game is over. The player has run out of chips.",
+        bullets_title="Important Instructions",
+        bullets=(
+            "The cards are still on the table - explain what happened in this final hand",
+            "Tell the user they have no chips left and the game is over",
+            "Thank them for playing",
+            "Ask if they want to hang up or stay connected",
+            "You cannot start a new game - they are out of chips",
+            "Be sympathetic but professional about their loss"
+        ),
+        criteria="User has acknowledged the game is over",
+        functions=(),
+        valid_steps=()
+    ),
+)
+
 
 class BlackjackDealer(AgentBase):
     """Dealer - Your professional blackjack dealer"""
@@ -27,163 +138,117 @@ class BlackjackDealer(AgentBase):
             port=5000
         )
         
+        # Per-call rate limits and global concurrency limit for /swml and /swml/swaig
+        self.admission = AdmissionController.from_env()
+        
+        # Response wording - verbose narration or terse, budgeted responses for faster TTS
+        self.phrases = Phrasebook.from_env()
+        self.response_stats = ResponseStats()
+        
+        # Live per-player stats, fed by every resolved hand and snapshotted to disk
+        # Players are keyed by a keyed hash of their number, so neither holds a raw caller number
+        # The last snapshot is loaded when the server starts (see lifespan in get_app), like the handoff file
+        self.player_key = load_key()
+        self.stats_file = os.environ.get("BLACKJACK_STATS_FILE", "blackjack_stats.json")
+        self.stats_interval = float(os.environ.get("BLACKJACK_STATS_INTERVAL", 60))
+        self.stats = PlayerStats()
+        
+        # One seeded RNG for every shuffle, so a recorded session replays card for card
+        seed = os.environ.get("BLACKJACK_SEED")
+        self.seed = int(seed) if seed else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        
+        # Optional recording of SWML requests and SWAIG tool calls for replay (see replay.py)
+        record_file = os.environ.get("BLACKJACK_RECORD_FILE")
+        self.recorder = None
+        if record_file:
+            self.recorder = SessionRecorder(
+                record_file, self.seed, self.player_key,
+                response_mode=self.phrases.mode,
+                response_budget=self.phrases.budget
+            )
+        
+        # Table actors - serialize calls per table, share a shoe between seats
+        self.tables = TableEngine(new_deck, rng=self.rng)
+        
+        # Graceful drain on SIGTERM - live table and session state is handed to the next process
+        self.draining = False
+        self.drain_timeout = float(os.environ.get("BLACKJACK_DRAIN_TIMEOUT", 8))
+        # Loaded when the server starts (see lifespan in get_app), so a dealer built by a script or test never consumes it
+        self.handoff_file = os.environ.get("BLACKJACK_HANDOFF_FILE", "blackjack_handoff.json")
+        
+        # Set by warm_up() once SWML and the static file index are primed - /health reports it
+        self.ready = False
+        self.static_files = None
+        self.startup_timings = {}
+        
         # Set up dealer personality
-        self.prompt_add_section(
-            "Personality", 
-            "You are a professional blackjack dealer at a high-end casino. You're friendly but professional, "
-            "explaining the rules clearly and maintaining the excitement of the game. You follow standard "
-            "casino blackjack rules: dealer hits on 16 and below, stands on 17 and above."
-        )
+        self.prompt_add_section("Personality", DEALER_PERSONALITY)
         
-        # Define conversation contexts
+        # Define conversation contexts from the pre-built step specs
         contexts = self.define_contexts()
         
         default_context = contexts.add_context("default") \
-            .add_section("Goal", "Run an engaging blackjack game, manage bets, deal cards, and ensure fair play according to casino rules.")
-        
-        # Betting phase - this is the starting point
-        default_context.add_step("betting") \
-            .add_section("Current Task", "Take the player's bet") \
-            .add_bullets("Betting Process", [
-                "The player has ${global_data.current_chips} chips",
-                "Ask how much they'd like to bet (minimum 10, maximum ${global_data.current_chips})",
-                "When they tell you an amount, call place_bet function with that amount",
-            ]) \
-            .set_step_criteria("A valid bet has been placed and cards have been dealt") \
-            .set_functions(["place_bet"]) \
-            .set_valid_steps(["playing"])
-        
-        # Playing phase
-        default_context.add_step("playing") \
-            .add_section("Current Task", "Manage the active blackjack hand") \
-            .add_bullets("CRITICAL RULES - YOU MUST FOLLOW THESE", [
-                "The player currently has ${global_data.game_state.player_score} points",
-                "When player says 'hit' or wants another card: YOU MUST CALL THE hit FUNCTION",
-                "When player says 'stand' or wants to stay: YOU MUST CALL THE stand FUNCTION", 
-                "When player says 'double down': YOU MUST CALL THE double_down FUNCTION",
-                "Split is NOT available at this table - do not offer it as an option",
-                "NEVER make up cards or scores - ONLY use what the functions return",
-                "NEVER deal cards yourself - the hit function deals cards",
-                "NEVER calculate scores yourself - the functions calculate scores",
-                "The hit function will tell you EXACTLY what card was drawn and the new score",
-                "If the function says 'the hand continues', keep playing - player has NOT busted",
-                "Only say the player busted if the function explicitly says 'bust'"
-            ]) \
-            .set_step_criteria("Hand is complete and the winner is determined.") \
-            .set_functions(["hit", "stand", "double_down"]) \
-            .set_valid_steps(["hand_complete", "game_over"])
-
-
-        # Post-Game phase
-        default_context.add_step("hand_complete") \
-            .add_section("Current Task", "The hand is complete. Review the results and wait for player's decision.") \
-            .add_bullets("Important Instructions", [
-                "The cards are still on the table - explain what happened in this hand",
-                "Tell the user their chip count and how much they won or lost",
-                "Ask if they want to play another hand",
-                "DO NOT take any bets or start a new game until you call new_hand",
-                "If the user wants to play again, you MUST call new_hand first",
-                "The new_hand function will reset the table and change to betting step",
-                "Only after calling new_hand can you take a new bet"
-            ]) \
-            .set_step_criteria("User has indicated whether they want to play another hand") \
-            .set_functions(["new_hand"]) \
-            .set_valid_steps(["betting"])
-        
-        # Game Over phase - when player runs out of chips
-        default_context.add_step("game_over") \
-            .add_section("Current Task", "The game is over. The player has run out of chips.") \
-            .add_bullets("Important Instructions", [
-                "The cards are still on the table - explain what happened in this final hand",
-                "Tell the user they have no chips left and the game is over",
-                "Thank them for playing",
-                "Ask if they want to hang up or stay connected",
-                "You cannot start a new game - they are out of chips",
-                "Be sympathetic but professional about their loss"
-            ]) \
-            .set_step_criteria("User has acknowledged the game is over") \
-            .set_functions([]) \
-            .set_valid_steps([])
+            .add_section("Goal", DEALER_GOAL)
+        
+        for step in DEALER_STEPS:
+            default_context.add_step(step.name) \
+                .add_section("Current Task", step.task) \
+                .add_bullets(step.bullets_title, list(step.bullets)) \
+                .set_step_criteria(step.criteria) \
+                .set_functions(list(step.functions)) \
+                .set_valid_steps(list(step.valid_steps))
         
         # No resolution phase needed - handled automatically in hit/stand/double_down
         
         # Helper function to get/initialize game state
         def get_game_state(raw_data):
-            """Get the current game state from global_data, or initialize if needed"""
+            """Get the current game state from global_data as a TableState, or initialize if needed"""
             global_data = raw_data.get('global_data', {})
             
-            # Default state structure
-            default = {
-                "deck": [],
-                "player_hand": [],
-                "dealer_hand": [],
-                "player_score": 0,
-                "dealer_score": 0,
-                "current_bet": 0,
-                "player_chips": 1000,
-                "game_phase": "waiting",  # waiting, bet_placed, playing, resolution
-                "hand_in_progress": False
-            }
-            
-            return global_data.get('game_state', default), global_data
+            game_state = global_data.get('game_state')
+            if game_state:
+                return TableState.from_wire(game_state), global_data
+            # Fall back to the state this call last saved here (or in the process before a restart)
+            return self.tables.recorded_state(raw_data.get('call_id')) or TableState(), global_data
+        
+        # Helper function to find the cards to deal from
+        def get_deck(raw_data, state):
+            """The table's shared shoe if this call is seated with others, otherwise the call's own deck"""
+            table = self.tables.shared_table_for(raw_data.get('call_id'))
+            return table.shoe if table is not None else state.deck
         
         # Helper function to add save action to result
-        def add_save_action(result, game_state, global_data):
+        def add_save_action(result, state, global_data, raw_data):
             """Add the save game state action to the result"""
-            global_data['game_state'] = game_state
+            global_data['game_state'] = state.to_wire()
             # Also update top-level chip count for AI visibility
-            global_data['current_chips'] = game_state['player_chips']
+            global_data['current_chips'] = state.player_chips
             result.update_global_data(global_data)
+            self.tables.record_state(raw_data.get('call_id'), state)
             return result
         
         # Helper function to resolve the hand and determine payouts
-        def resolve_hand_internally(game_state):
-            """Resolve the hand and update chips - returns result text"""
-            player_score = game_state["player_score"]
-            dealer_score = game_state["dealer_score"]
-            bet = game_state["current_bet"]
-            
-            # Determine winner
-            if player_score > 21:
-                result_text = "You bust. House wins."
-                winnings = 0
-            elif dealer_score > 21:
-                result_text = "I bust! You win!"
-                winnings = bet * 2
-            elif player_score > dealer_score:
-                result_text = "You win!"
-                winnings = bet * 2
-            elif dealer_score > player_score:
-                result_text = "House wins."
-                winnings = 0
-            else:
-                result_text = "Push. We tied."
-                winnings = bet  # Return the bet
+        def resolve_hand_internally(state, speech, raw_data):
+            """Resolve the hand, update chips and add the result to speech - returns result text and winnings"""
+            player_score = state.player_score
+            dealer_score = state.dealer_score
+            bet = state.current_bet
             
-            # Check for blackjack bonus
-            if player_score == 21 and len(game_state["player_hand"]) == 2 and dealer_score != 21:
-                result_text = "Blackjack pays three to two!"
-                winnings = int(bet * 2.5)
+            result_text, winnings = settle(player_score, dealer_score, len(state.player_hand), bet)
             
-            game_state["player_chips"] += winnings
-            game_state["hand_in_progress"] = False
-            game_state["game_phase"] = "waiting"
+            state.player_chips += winnings
+            state.hand_in_progress = False
+            state.game_phase = "waiting"
             
-            # Don't clear hands here - keep them for display in hand_complete step
-            response = f"\n\nHand complete! {result_text}\n"
-            response += f"Player had {player_score}, Dealer had {dealer_score}.\n"
-            if winnings > bet:
-                response += f"Player wins {winnings - bet} chips! "
-            elif winnings == bet:
-                response += f"Player's bet of {bet} chips is returned. "
-            else:
-                response += f"Player loses their {bet} chip bet. "
-            response += f"Player now has {game_state['player_chips']} chips total."
+            # Feed the live stats - callers are keyed by a pseudonym of their number, falling back to the call
+            caller = raw_data.get('caller_id_num') or raw_data.get('call_id') or "anonymous"
+            self.stats.record(pseudonym(caller, self.player_key), bet, winnings, result_text)
             
-            if game_state["player_chips"] < 10:
-                response += "\n\nYou're out of chips! Game over. Thanks for playing!"
+            # Don't clear hands here - keep them for display in hand_complete step
+            self.phrases.resolution(speech, result_text, player_score, dealer_score, bet, winnings, state.player_chips)
             
-            return response, result_text, winnings
+            return result_text, winnings
         
         # Define game functions
         @self.tool(
@@ -204,129 +269,115 @@ class BlackjackDealer(AgentBase):
         )
         def place_bet(args, raw_data):
             """Place a bet and prepare for a new hand"""
-            game_state, global_data = get_game_state(raw_data)
+            state, global_data = get_game_state(raw_data)
             amount = args["amount"]
             
             # Check if a hand is already in progress
-            if game_state.get("hand_in_progress", False):
+            if state.hand_in_progress:
                 return SwaigFunctionResult("There's already a hand in progress. Please finish it first.")
             
             # Check if player is out of chips
-            if game_state["player_chips"] < 10:
-                return SwaigFunctionResult(f"You only have {game_state['player_chips']} chips left, which is below the minimum bet of 10. Game over! Thanks for playing!")
+            if state.player_chips < 10:
+                return SwaigFunctionResult(f"You only have {state.player_chips} chips left, which is below the minimum bet of 10. Game over! Thanks for playing!")
             
-            if amount > game_state["player_chips"]:
-                return SwaigFunctionResult(f"You don't have that many chips. You have {game_state['player_chips']} chips.")
+            if amount > state.player_chips:
+                return SwaigFunctionResult(f"You don't have that many chips. You have {state.player_chips} chips.")
             
             if amount < 10:
                 return SwaigFunctionResult("Minimum bet is ten chips at this table.")
             
             # Update state for new bet
-            game_state["current_bet"] = amount
-            game_state["player_chips"] -= amount
-            game_state["game_phase"] = "bet_placed"  # Ready to deal cards
-            game_state["hand_in_progress"] = True
+            state.current_bet = amount
+            state.player_chips -= amount
+            state.game_phase = "bet_placed"  # Ready to deal cards
+            state.hand_in_progress = True
             
             # Clear hands for new game
-            game_state["player_hand"] = []
-            game_state["dealer_hand"] = []
-            game_state["player_score"] = 0
-            game_state["dealer_score"] = 0
-            
-            # Save state first
-            global_data['game_state'] = game_state
+            state.clear_hands()
             
             # Now automatically deal the cards
+            # Seated with others: deal from the table's shoe, which reshuffles per seat
+            table = self.tables.shared_table_for(raw_data.get('call_id'))
+            if table is not None:
+                shuffled_new_deck = table.prepare_shoe()
             # Check if we have enough cards (need at least 15 for safety)
-            if len(game_state["deck"]) < 15:
-                game_state["deck"] = self._create_deck()
-                random.shuffle(game_state["deck"])
+            elif len(state.deck) < 15:
+                state.deck = new_deck()
+                self.rng.shuffle(state.deck)
                 shuffled_new_deck = True
             else:
                 shuffled_new_deck = False
+            deck = get_deck(raw_data, state)
             
-            # Deal cards
-            game_state["player_hand"] = [
-                game_state["deck"].pop(),
-                game_state["deck"].pop()
-            ]
-            game_state["dealer_hand"] = [
-                game_state["deck"].pop(),
-                game_state["deck"].pop()
-            ]
-            
-            # Calculate scores
-            game_state["player_score"] = self._calculate_score(game_state["player_hand"])
-            game_state["dealer_score"] = self._calculate_score(game_state["dealer_hand"])
-            game_state["game_phase"] = "playing"
+            # Deal cards - scores are kept up to date as each card lands
+            state.deal_player(deck)
+            state.deal_player(deck)
+            state.deal_dealer(deck)
+            state.deal_dealer(deck)
+            state.game_phase = "playing"
             
             # Build response
-            response = f"Perfect! You've bet {amount} chips. You have {game_state['player_chips']} chips remaining.\n\n"
+            speech = self.phrases.speech()
+            self.phrases.bet_placed(speech, amount, state.player_chips)
             if shuffled_new_deck:
-                response += "Shuffling a fresh deck.\n\n"
-            
-            player_cards_str = ", ".join([self._card_name(card) for card in game_state["player_hand"]])
-            dealer_visible = self._card_name(game_state["dealer_hand"][0])
-            
-            response += f"Cards dealt! You have: {player_cards_str} for a total of {game_state['player_score']} points.\n"
-            response += f"I'm showing {dealer_visible} with my other card face down."
+                self.phrases.shuffled(speech)
+            self.phrases.cards_dealt(speech, state.player_cards(), state.player_score, CARDS[state.dealer_hand[0]])
             
             # Check for blackjack
-            if game_state["player_score"] == 21:
-                response += "\n\nBlackjack! Twenty-one!"
+            if state.player_score == 21:
+                self.phrases.blackjack(speech)
                 # Play dealer's hand and resolve immediately
-                response += self._play_dealer_hand(game_state)
-                resolution_text, result_text, winnings = resolve_hand_internally(game_state)
-                response += resolution_text
+                self._play_dealer_hand(state, deck, speech)
+                result_text, winnings = resolve_hand_internally(state, speech, raw_data)
             else:
-                response += "\n\nThe hand is now in play. What would you like to do?"
+                self.phrases.hand_in_play(speech)
             
-            result = SwaigFunctionResult(response)
+            result = SwaigFunctionResult(speech.render())
             
             # Save complete state
-            add_save_action(result, game_state, global_data)
+            add_save_action(result, state, global_data, raw_data)
             
             # Send UI updates
             # Send a clear event to ensure UI is clean before dealing
             result.swml_user_event({
                 "type": "clear_table",
-                "chips": game_state["player_chips"] + amount
+                "chips": state.player_chips + amount
             })
             
             result.swml_user_event({
                 "type": "bet_placed",
                 "amount": amount,
-                "remaining_chips": game_state["player_chips"]
+                "remaining_chips": state.player_chips
             })
             
             result.swml_user_event({
                 "type": "cards_dealt",
-                "player_hand": game_state["player_hand"],
-                "dealer_hand": [game_state["dealer_hand"][0], None],  # Hide hole card
-                "player_score": game_state["player_score"],
-                "dealer_visible_score": self._calculate_score([game_state["dealer_hand"][0]])
+                "player_hand": state.player_cards(),
+                "dealer_hand": [CARDS[state.dealer_hand[0]], None],  # Hide hole card
+                "player_score": state.player_score,
+                "dealer_visible_score": hand_score(state.dealer_hand[:1])
             })
             
             # If blackjack, send resolution events and change to appropriate step
-            if game_state["player_score"] == 21:
+            if state.player_score == 21:
                 result.swml_user_event({
                     "type": "dealer_play",
-                    "dealer_hand": game_state["dealer_hand"],
-                    "dealer_score": game_state["dealer_score"],
-                    "dealer_busted": game_state["dealer_score"] > 21
+                    "dealer_hand": state.dealer_cards(),
+                    "dealer_score": state.dealer_score,
+                    "dealer_busted": state.dealer_score > 21
                 })
                 
                 result.swml_user_event({
                     "type": "hand_resolved",
                     "result": result_text,
-                    "player_score": game_state["player_score"],
-                    "dealer_score": game_state["dealer_score"],
+                    "player_score": state.player_score,
+                    "dealer_score": state.dealer_score,
                     "winnings": winnings,
-                    "total_chips": game_state["player_chips"]
+                    "total_chips": state.player_chips
                 })
                 
                 # Change to game_over if out of chips, otherwise hand_complete
-                if game_state["player_chips"] < 10:
+                if state.player_chips < 10:
                     result.swml_change_step("game_over")
                 else:
                     result.swml_change_step("hand_complete")
@@ -345,78 +396,73 @@ class BlackjackDealer(AgentBase):
         )
         def hit(args, raw_data):
             """Deal another card to the player"""
-            game_state, global_data = get_game_state(raw_data)
+            state, global_data = get_game_state(raw_data)
             
             # Verify we can hit
-            if game_state["game_phase"] != "playing":
+            if state.game_phase != "playing":
                 return SwaigFunctionResult("You can't hit right now. The hand is not in play.")
             
-            if not game_state.get("hand_in_progress", False):
+            if not state.hand_in_progress:
                 return SwaigFunctionResult("No hand in progress. Please place a bet first.")
             
             # Draw a card
-            new_card = game_state["deck"].pop()
-            game_state["player_hand"].append(new_card)
-            game_state["player_score"] = self._calculate_score(game_state["player_hand"])
+            deck = get_deck(raw_data, state)
+            new_card = state.deal_player(deck)
             
             # Build response
-            player_cards_str = ", ".join([self._card_name(card) for card in game_state["player_hand"]])
-            response = f"The player hits and receives: {self._card_name(new_card)}.\n"
-            response += f"Player's complete hand: {player_cards_str}.\n"
-            response += f"Player's total: {game_state['player_score']} points."
+            speech = self.phrases.speech()
+            self.phrases.player_hit(speech, new_card, state.player_cards(), state.player_score)
             
-            if game_state["player_score"] > 21:
-                response += " That's a bust! You're over twenty-one."
+            if state.player_score > 21:
+                self.phrases.player_bust(speech)
                 # Resolve the hand immediately
-                resolution_text, result_text, winnings = resolve_hand_internally(game_state)
-                response += resolution_text
-            elif game_state["player_score"] == 21:
-                response += " Twenty-one! Perfect!"
+                result_text, winnings = resolve_hand_internally(state, speech, raw_data)
+            elif state.player_score == 21:
+                self.phrases.twenty_one(speech)
                 # Auto-play dealer's hand
-                response += self._play_dealer_hand(game_state)
+                self._play_dealer_hand(state, deck, speech)
                 # Resolve the hand
-                resolution_text, result_text, winnings = resolve_hand_internally(game_state)
-                response += resolution_text
+                result_text, winnings = resolve_hand_internally(state, speech, raw_data)
             else:
                 # Clearly state the situation and current score
-                response += f"\n\nYou have {game_state['player_score']} points. The hand continues. What would you like to do?"
+                self.phrases.hand_continues(speech, state.player_score)
                 result_text = None
                 winnings = None
             
-            result = SwaigFunctionResult(response)
+            result = SwaigFunctionResult(speech.render())
             
             # Save state
-            add_save_action(result, game_state, global_data)
+            add_save_action(result, state, global_data, raw_data)
             
             # Send UI update
             result.swml_user_event({
                 "type": "player_hit",
                 "new_card": new_card,
-                "player_hand": game_state["player_hand"],
-                "player_score": game_state["player_score"],
-                "busted": game_state["player_score"] > 21
+                "player_hand": state.player_cards(),
+                "player_score": state.player_score,
+                "busted": state.player_score > 21
             })
             
             # If hand is resolved, send updates
-            if game_state["player_score"] >= 21:
-                if game_state["player_score"] == 21:
+            if state.player_score >= 21:
+                if state.player_score == 21:
                     result.swml_user_event({
                         "type": "dealer_play",
-                        "dealer_hand": game_state["dealer_hand"],
-                        "dealer_score": game_state["dealer_score"],
-                        "dealer_busted": game_state["dealer_score"] > 21
+                        "dealer_hand": state.dealer_cards(),
+                        "dealer_score": state.dealer_score,
+                        "dealer_busted": state.dealer_score > 21
                     })
                 if result_text and winnings is not None:
                     result.swml_user_event({
                         "type": "hand_resolved",
                         "result": result_text,
-                        "player_score": game_state["player_score"],
-                        "dealer_score": game_state["dealer_score"],
+                        "player_score": state.player_score,
+                        "dealer_score": state.dealer_score,
                         "winnings": winnings,
-                        "total_chips": game_state["player_chips"]
+                        "total_chips": state.player_chips
                     })
                     # Change to game_over if out of chips, otherwise hand_complete
-                    if game_state["player_chips"] < 10:
+                    if state.player_chips < 10:
                         result.swml_change_step("game_over")
                     else:
                         result.swml_change_step("hand_complete")
@@ -435,53 +481,53 @@ class BlackjackDealer(AgentBase):
         )
         def stand(args, raw_data):
             """Player stands, dealer's turn begins"""
-            game_state, global_data = get_game_state(raw_data)
+            state, global_data = get_game_state(raw_data)
             
             # Verify we can stand
-            if game_state["game_phase"] != "playing":
+            if state.game_phase != "playing":
                 return SwaigFunctionResult("You can't stand right now. The hand is not in play.")
             
-            if not game_state.get("hand_in_progress", False):
+            if not state.hand_in_progress:
                 return SwaigFunctionResult("No hand in progress. Please place a bet first.")
             
-            response = f"The player stands with {game_state['player_score']} points. Now it's the dealer's turn.\n"
+            speech = self.phrases.speech()
+            self.phrases.player_stands(speech, state.player_score)
             
             # Play dealer's hand
-            response += self._play_dealer_hand(game_state)
+            self._play_dealer_hand(state, get_deck(raw_data, state), speech)
             
             # Resolve the hand immediately
-            resolution_text, result_text, winnings = resolve_hand_internally(game_state)
-            response += resolution_text
+            result_text, winnings = resolve_hand_internally(state, speech, raw_data)
             
-            result = SwaigFunctionResult(response)
+            result = SwaigFunctionResult(speech.render())
             
             # Save state
-            add_save_action(result, game_state, global_data)
+            add_save_action(result, state, global_data, raw_data)
             
             # Send UI updates
             result.swml_user_event({
                 "type": "player_stand",
-                "player_score": game_state["player_score"]
+                "player_score": state.player_score
             })
             
             result.swml_user_event({
                 "type": "dealer_play",
-                "dealer_hand": game_state["dealer_hand"],
-                "dealer_score": game_state["dealer_score"],
-                "dealer_busted": game_state["dealer_score"] > 21
+                "dealer_hand": state.dealer_cards(),
+                "dealer_score": state.dealer_score,
+                "dealer_busted": state.dealer_score > 21
             })
             
             result.swml_user_event({
                 "type": "hand_resolved",
                 "result": result_text,
-                "player_score": game_state["player_score"],
-                "dealer_score": game_state["dealer_score"],
+                "player_score": state.player_score,
+                "dealer_score": state.dealer_score,
                 "winnings": winnings,
-                "total_chips": game_state["player_chips"]
+                "total_chips": state.player_chips
             })
             
             # Change to game_over if out of chips, otherwise hand_complete
-            if game_state["player_chips"] < 10:
+            if state.player_chips < 10:
                 result.swml_change_step("game_over")
             else:
                 result.swml_change_step("hand_complete")
@@ -500,77 +546,74 @@ class BlackjackDealer(AgentBase):
         )
         def double_down(args, raw_data):
             """Double down - double bet, take one card, then stand"""
-            game_state, global_data = get_game_state(raw_data)
+            state, global_data = get_game_state(raw_data)
             
             # Verify we can double down
-            if game_state["game_phase"] != "playing":
+            if state.game_phase != "playing":
                 return SwaigFunctionResult("You can't double down right now.")
             
-            if len(game_state["player_hand"]) != 2:
+            if len(state.player_hand) != 2:
                 return SwaigFunctionResult("You can only double down on your first two cards.")
             
-            if game_state["current_bet"] > game_state["player_chips"]:
-                return SwaigFunctionResult(f"You need {game_state['current_bet']} more chips to double down.")
+            if state.current_bet > state.player_chips:
+                return SwaigFunctionResult(f"You need {state.current_bet} more chips to double down.")
             
             # Double the bet
-            game_state["player_chips"] -= game_state["current_bet"]
-            game_state["current_bet"] *= 2
+            state.player_chips -= state.current_bet
+            state.current_bet *= 2
             
             # Take one card
-            new_card = game_state["deck"].pop()
-            game_state["player_hand"].append(new_card)
-            game_state["player_score"] = self._calculate_score(game_state["player_hand"])
+            deck = get_deck(raw_data, state)
+            new_card = state.deal_player(deck)
             
-            response = f"The player doubles down! The bet is now doubled to {game_state['current_bet']} chips.\n"
-            response += f"Player receives one final card: {self._card_name(new_card)}.\n"
-            response += f"Player's final total: {game_state['player_score']} points. Player has {game_state['player_chips']} chips remaining."
+            speech = self.phrases.speech()
+            self.phrases.doubled_down(speech, state.current_bet, new_card, state.player_score, state.player_chips)
             
-            if game_state["player_score"] > 21:
-                response += " That's a bust!"
+            if state.player_score > 21:
+                self.phrases.double_bust(speech)
                 # Resolve immediately
-                resolution_text, result_text, winnings = resolve_hand_internally(game_state)
-                response += resolution_text
+                result_text, winnings = resolve_hand_internally(state, speech, raw_data)
             else:
                 # Dealer plays
-                response += "\n\n" + self._play_dealer_hand(game_state)
+                self.phrases.pause(speech)
+                self._play_dealer_hand(state, deck, speech)
                 # Resolve the hand
-                resolution_text, result_text, winnings = resolve_hand_internally(game_state)
-                response += resolution_text
+                result_text, winnings = resolve_hand_internally(state, speech, raw_data)
             
-            result = SwaigFunctionResult(response)
+            result = SwaigFunctionResult(speech.render())
             
             # Save state
-            add_save_action(result, game_state, global_data)
+            add_save_action(result, state, global_data, raw_data)
             
             # Send UI updates
             result.swml_user_event({
                 "type": "double_down",
-                "new_bet": game_state["current_bet"],
+                "new_bet": state.current_bet,
                 "new_card": new_card,
-                "player_hand": game_state["player_hand"],
-                "player_score": game_state["player_score"],
-                "remaining_chips": game_state["player_chips"]
+                "player_hand": state.player_cards(),
+                "player_score": state.player_score,
+                "remaining_chips": state.player_chips
             })
             
-            if game_state["player_score"] <= 21:
+            if state.player_score <= 21:
                 result.swml_user_event({
                     "type": "dealer_play",
-                    "dealer_hand": game_state["dealer_hand"],
-                    "dealer_score": game_state["dealer_score"],
-                    "dealer_busted": game_state["dealer_score"] > 21
+                    "dealer_hand": state.dealer_cards(),
+                    "dealer_score": state.dealer_score,
+                    "dealer_busted": state.dealer_score > 21
                 })
             
             result.swml_user_event({
                 "type": "hand_resolved",
                 "result": result_text,
-                "player_score": game_state["player_score"],
-                "dealer_score": game_state["dealer_score"],
+                "player_score": state.player_score,
+                "dealer_score": state.dealer_score,
                 "winnings": winnings,
-                "total_chips": game_state["player_chips"]
+                "total_chips": state.player_chips
             })
             
             # Change to game_over if out of chips, otherwise hand_complete
-            if game_state["player_chips"] < 10:
+            if state.player_chips < 10:
                 result.swml_change_step("game_over")
             else:
                 result.swml_change_step("hand_complete")
@@ -589,22 +632,21 @@ class BlackjackDealer(AgentBase):
         )
         def new_hand(args, raw_data):
             """Start a new hand and transition back to betting step"""
-            game_state, global_data = get_game_state(raw_data)
+            state, global_data = get_game_state(raw_data)
             
             # Reset the game state for a new hand
-            game_state["player_hand"] = []
-            game_state["dealer_hand"] = []
-            game_state["player_score"] = 0
-            game_state["dealer_score"] = 0
-            game_state["current_bet"] = 0
-            game_state["hand_in_progress"] = False
-            game_state["game_phase"] = "waiting"
+            state.clear_hands()
+            state.current_bet = 0
+            state.hand_in_progress = False
+            state.game_phase = "waiting"
             
             # Create response that changes step and resets UI
-            result = SwaigFunctionResult(f"Starting a new hand. You have {game_state['player_chips']} chips.")
+            speech = self.phrases.speech()
+            self.phrases.new_hand(speech, state.player_chips)
+            result = SwaigFunctionResult(speech.render())
             
             # Save the reset state
-            add_save_action(result, game_state, global_data)
+            add_save_action(result, state, global_data, raw_data)
             
             # Change to betting step
             result.swml_change_step("betting")
@@ -612,7 +654,7 @@ class BlackjackDealer(AgentBase):
             # Send UI reset event to clear the table
             result.swml_user_event({
                 "type": "game_reset",
-                "chips": game_state["player_chips"]
+                "chips": state.player_chips
             })
             
             return result
@@ -661,11 +703,33 @@ class BlackjackDealer(AgentBase):
             "current_chips": 1000  # Start with initial chip count visible
         })
     
+    def on_function_call(self, name, args, raw_data=None):
+        """Time each tool and record how long a response the AI will have to read back"""
+        # Snapshot the request before the handler runs - add_save_action writes the new state into raw_data
+        request = self.recorder.snapshot(raw_data) if self.recorder is not None else None
+        start = time.perf_counter()
+        result = super().on_function_call(name, args, raw_data)
+        elapsed = time.perf_counter() - start
+        if isinstance(result, SwaigFunctionResult):
+            self.response_stats.record(name, self.phrases.mode, len(result.response), elapsed)
+            if self.recorder is not None:
+                self.recorder.record_swaig(name, args, request, result.to_dict(), elapsed)
+        return result
+    
     def on_swml_request(self, request_data=None, callback_path=None, request=None):
         """Override to dynamically set video and audio URLs based on request origin"""
         # Get the host from the request object if available
         host = None
         
+        # Sit the call at a shared table when the SWML URL asks for one (?table=<id>)
+        call_id = ((request_data or {}).get("call") or {}).get("call_id")
+        table_id = request.query_params.get("table") if request else None
+        if call_id and table_id:
+            self.tables.seat(table_id, call_id)
+            print(f"Seated call {call_id} at table {table_id}")
+        if self.recorder is not None:
+            self.recorder.record_swml(request_data, table_id)
+        
         if request:
             # Try to get host from the Starlette request headers
             headers = dict(request.headers)
@@ -710,12 +774,48 @@ class BlackjackDealer(AgentBase):
             from fastapi import FastAPI, Request, Response
             from fastapi.middleware.cors import CORSMiddleware
             from fastapi.responses import JSONResponse
-            from fastapi.staticfiles import StaticFiles
+            from static_index import IndexedStaticFiles
+            
+            @asynccontextmanager
+            async def lifespan(app):
+                """Pick up the previous process's tables and stats, then warm up in the background so the port opens immediately
+                On the way out, keep the stats collected since the last snapshot and hand live tables to the next process"""
+                if self.handoff_file:
+                    try:
+                        self.load_handoff()
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"Could not restore tables from {self.handoff_file}: {e!r}")
+                if self.stats_file:
+                    self.load_stats()
+                self._warm_up_task = asyncio.create_task(self._warm_up_in_background())
+                if self.stats_file:
+                    self._stats_task = asyncio.create_task(self._snapshot_stats_periodically())
+                
+                yield
+                
+                # Each step on its own, so one failing doesn't lose the others
+                if self.stats_file:
+                    self._stats_task.cancel()
+                    try:
+                        await self.snapshot_stats()
+                    except Exception as e:
+                        print(f"Could not snapshot stats to {self.stats_file}: {e!r}")
+                if self.handoff_file:
+                    try:
+                        self.save_handoff()
+                    except Exception as e:
+                        print(f"Could not save tables to {self.handoff_file}: {e!r}")
+                if self.recorder is not None:
+                    try:
+                        self.recorder.close()
+                    except Exception as e:
+                        print(f"Could not close recording {self.recorder.path}: {e!r}")
             
             # Create the FastAPI app
             app = FastAPI(
                 title="SignalWire Blackjack",
-                description="AI-powered blackjack dealer with Dealer"
+                description="AI-powered blackjack dealer with Dealer",
+                lifespan=lifespan
             )
             
             # Add CORS middleware
@@ -734,9 +834,21 @@ class BlackjackDealer(AgentBase):
             # API Routes (before static files so they take precedence)
             @app.get("/health")
             async def health_check():
+                if self.draining:
+                    return JSONResponse(status_code=503, content={
+                        "status": "draining",
+                        "agent": self.get_name(),
+                        "in_flight": self.in_flight()
+                    })
+                if not self.ready:
+                    return JSONResponse(status_code=503, content={
+                        "status": "starting",
+                        "agent": self.get_name()
+                    })
                 return JSONResponse(content={
                     "status": "healthy",
-                    "agent": self.get_name()
+                    "agent": self.get_name(),
+                    "startup": self.startup_timings
                 })
             
             @app.get("/api/info")
@@ -751,10 +863,112 @@ class BlackjackDealer(AgentBase):
                         "ui": "/",
                         "swml": "/swml",
                         "swaig": "/swml/swaig",
-                        "health": "/health"
+                        "health": "/health",
+                        "admission": "/api/admission",
+                        "tables": "/api/tables",
+                        "responses": "/api/responses",
+                        "stats": "/api/stats"
                     }
                 })
             
+            @app.get("/api/stats")
+            async def get_stats():
+                """Casino-wide totals, distinct players and the biggest wins"""
+                return JSONResponse(content={
+                    **self.stats.summary(),
+                    "biggest_wins": self.stats.top_wins()
+                })
+            
+            @app.get("/api/stats/leaderboard")
+            async def get_leaderboard(by: str = "net_chips", limit: int = 10, min_hands: int = 1):
+                """Top players by net_chips, hands_played, win_rate or biggest_win"""
+                try:
+                    return JSONResponse(content=self.stats.leaderboard(by, max(1, min(limit, 100)), min_hands))
+                except ValueError as e:
+                    return JSONResponse(status_code=400, content={"error": str(e)})
+            
+            @app.get("/api/stats/players/{player}")
+            async def get_player_stats(player: str):
+                """Stats for one player by pseudonym, if they are among the tracked players"""
+                summary = self.stats.player(player)
+                if summary is None:
+                    return JSONResponse(status_code=404, content={"error": "Player not tracked"})
+                return JSONResponse(content=summary)
+            
+            @app.get("/api/responses")
+            async def get_response_stats():
+                """Report response length and generation time per tool and mode"""
+                return JSONResponse(content={
+                    "mode": self.phrases.mode,
+                    "budget": self.phrases.budget,
+                    "tools": self.response_stats.summary()
+                })
+            
+            @app.get("/api/tables")
+            async def get_tables():
+                """Report table, seat and queue counts"""
+                return JSONResponse(content=self.tables.stats())
+            
+            @app.get("/api/admission")
+            async def get_admission_stats():
+                """Report load, queued and shed request counts"""
+                return JSONResponse(content=self.admission.stats())
+            
+            @app.middleware("http")
+            async def admission_control(request: Request, call_next):
+                """Rate limit each call and cap concurrent SWML/SWAIG work"""
+                path = request.url.path.rstrip("/")
+                if request.method != "POST" or path not in (self.route, f"{self.route}/swaig"):
+                    return await call_next(request)
+                
+                is_swaig = path.endswith("/swaig")
+                # Only authenticated requests may spend a call's rate limit or a concurrency slot
+                if not self._is_authorized(request):
+                    return JSONResponse(
+                        status_code=401,
+                        content={"detail": "Unauthorized"},
+                        headers={"WWW-Authenticate": "Basic"}
+                    )
+                # While draining, calls already at the table keep playing but new calls go elsewhere
+                if self.draining and not is_swaig:
+                    return self._overload_response(is_swaig)
+                try:
+                    body = swaig_codec.loads(await request.body())
+                    request.state.parsed_body = body  # picked up by CodecRequest.json()
+                except ValueError:
+                    body = {}
+                if is_swaig:
+                    call_id = body.get("call_id")
+                else:
+                    call_id = (body.get("call") or {}).get("call_id")
+                table_id = self.tables.table_id_for(call_id)
+                
+                if call_id and not self.admission.allow(call_id, table_id):
+                    return self._overload_response(is_swaig)
+                
+                if not await self.admission.acquire():
+                    return self._overload_response(is_swaig)
+                try:
+                    return await call_next(request)
+                finally:
+                    self.admission.release()
+            
+            # SWAIG function calls - registered before the SDK router so parsing and
+            # serialization go through swaig_codec instead of stdlib json
+            @app.post(f"{self.route}/swaig")
+            @app.post(f"{self.route}/swaig/")
+            async def handle_swaig(request: Request, response: Response):
+                """Handle SWAIG function calls with the fast JSON codec"""
+                request = CodecRequest(request.scope, request.receive)
+                try:
+                    body = await request.json()
+                except ValueError:
+                    # Same answer the SDK route gives for a body it can't parse
+                    return JSONResponse(status_code=400, content={"error": "Missing function name"})
+                # Run on the call's table actor so calls at one table never interleave
+                result = await self.tables.submit(body.get("call_id"), self._handle_swaig_request, request, response)
+                return self._encode_response(result, response)
+            
             # Create router for SWML endpoints (with auth)
             router = self.as_router()
             
@@ -765,67 +979,140 @@ class BlackjackDealer(AgentBase):
             @app.post("/swml")
             async def handle_swml(request: Request, response: Response):
                 """Handle POST to /swml - SignalWire's webhook endpoint"""
-                return await self._handle_root_request(request)
+                result = await self._handle_root_request(CodecRequest(request.scope, request.receive))
+                return self._encode_response(result, response)
             
             # Mount static files at root (this handles everything else)
             # The web directory contains all static files (HTML, JS, CSS, videos, card images, etc.)
             if self.web_dir.exists():
-                app.mount("/", StaticFiles(directory=str(self.web_dir), html=True), name="static")
+                self.static_files = IndexedStaticFiles(directory=str(self.web_dir), html=True)
+                app.mount("/", self.static_files, name="static")
             
             self._app = app
         
         return self._app
     
-    def _play_dealer_hand(self, game_state):
-        """Play out the dealer's hand according to casino rules"""
-        dealer_cards_str = ", ".join([self._card_name(card) for card in game_state["dealer_hand"]])
-        response = f"\nDealer reveals hole card. Dealer's complete hand: {dealer_cards_str} for {game_state['dealer_score']} points.\n"
+    def warm_up(self):
+        """Render the SWML once and index the static files so the first real call doesn't pay for it"""
+        start = time.perf_counter()
+        self._render_swml()
+        self.startup_timings["swml_render_ms"] = round((time.perf_counter() - start) * 1000, 2)
         
-        # Dealer draws cards according to rules
-        while game_state["dealer_score"] < 17:
-            new_card = game_state["deck"].pop()
-            game_state["dealer_hand"].append(new_card)
-            game_state["dealer_score"] = self._calculate_score(game_state["dealer_hand"])
-            response += f"Dealer draws {self._card_name(new_card)}. Dealer now has {game_state['dealer_score']} points.\n"
-        
-        if game_state["dealer_score"] > 21:
-            response += "Dealer busts! Over 21!"
-        else:
-            response += f"Dealer stands with {game_state['dealer_score']} points."
+        start = time.perf_counter()
+        if self.static_files is not None:
+            self.startup_timings["static_files"] = self.static_files.warm()
+        self.startup_timings["static_index_ms"] = round((time.perf_counter() - start) * 1000, 2)
         
-        return response
+        self.ready = True
+        print(f"Dealer warmed up: {self.startup_timings}")
     
-    def _create_deck(self):
-        """Create a standard 52-card deck"""
-        suits = ['hearts', 'diamonds', 'clubs', 'spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace']
-        deck = []
-        for suit in suits:
-            for rank in ranks:
-                value = 10 if rank in ['jack', 'queen', 'king'] else 11 if rank == 'ace' else int(rank)
-                deck.append({
-                    'rank': rank,
-                    'suit': suit,
-                    'value': value,
-                    'image': f"{rank}_of_{suit}.png"
-                })
-        return deck
+    async def _warm_up_in_background(self):
+        """Run warm_up() off the event loop - if it fails, log why and serve cold instead of starting forever"""
+        try:
+            await asyncio.to_thread(self.warm_up)
+        except Exception as e:
+            traceback.print_exc()
+            print(f"Warm-up failed, serving without it: {e!r}")
+            self.startup_timings["warm_up_error"] = repr(e)
+            self.ready = True
     
-    def _calculate_score(self, hand):
-        """Calculate the score of a hand, handling aces appropriately"""
-        score = sum(card['value'] for card in hand)
-        aces = sum(1 for card in hand if card['rank'] == 'ace')
-        
-        # Adjust for aces
-        while score > 21 and aces > 0:
-            score -= 10
-            aces -= 1
+    def start_draining(self):
+        """Stop accepting new calls - /health reports draining so the proxy moves traffic away"""
+        self.draining = True
+        print(f"Draining: waiting up to {self.drain_timeout}s for {self.in_flight()} in-flight requests")
+    
+    def in_flight(self):
+        """SWML/SWAIG requests running or queued right now"""
+        return self.admission.active + self.admission.waiting
+    
+    def save_handoff(self):
+        """Write seats, shared shoes and session state for the next process to pick up"""
+        write_snapshot(self.handoff_file, {"saved_at": time.time(), "tables": self.tables.to_dict()})
+        print(f"Saved {len(self.tables.seating)} seated calls to {self.handoff_file}")
+    
+    def load_handoff(self):
+        """Pick up the state the previous process saved on its way out (once)"""
+        path = Path(self.handoff_file)
+        if not path.exists():
+            return
+        data = swaig_codec.loads(path.read_bytes())
+        restored = self.tables.restore(data["tables"], age=time.time() - data["saved_at"])
+        path.unlink()
+        print(f"Restored {restored} seated calls from {self.handoff_file}")
+    
+    def load_stats(self):
+        """Pick up the last stats snapshot - a bad one is set aside rather than stopping the server"""
+        try:
+            self.stats = PlayerStats.load(self.stats_file)
+        except Exception as e:
+            print(f"Could not load stats from {self.stats_file}, starting empty: {e!r}")
+            # Keep the bad file for inspection instead of overwriting it at the next snapshot
+            try:
+                os.replace(self.stats_file, f"{self.stats_file}.bad")
+            except OSError:
+                pass
+    
+    async def snapshot_stats(self):
+        """Copy the stats on the event loop, write them to disk off it"""
+        await asyncio.to_thread(write_snapshot, self.stats_file, self.stats.to_dict())
+    
+    async def _snapshot_stats_periodically(self):
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            try:
+                await self.snapshot_stats()
+            except OSError as e:
+                print(f"Could not snapshot stats to {self.stats_file}: {e}")
+    
+    def _encode_response(self, result, response):
+        """Serialize a handler result with swaig_codec unless it is already a Response"""
+        if isinstance(result, Response):
+            return result
+        if isinstance(result, SwaigFunctionResult):
+            result = result.to_dict()
+        return Response(
+            content=swaig_codec.dumps(result),
+            status_code=response.status_code or 200,
+            media_type="application/json"
+        )
+    
+    def _is_authorized(self, request):
+        """Check the SWML basic auth credentials on a request"""
+        username, password = self.get_basic_auth_credentials()
+        scheme, _, encoded = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "basic":
+            return False
+        try:
+            supplied = base64.b64decode(encoded, validate=True)
+        except ValueError:
+            return False
+        return hmac.compare_digest(supplied, f"{username}:{password}".encode("utf-8"))
+    
+    def _overload_response(self, is_swaig):
+        """Fast answer for a shed request - speakable for SWAIG, retryable 503 for SWML"""
+        from fastapi.responses import JSONResponse
         
-        return score
+        if is_swaig:
+            return self._encode_response(SwaigFunctionResult(OVERLOAD_MESSAGE), Response())
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Dealer is busy, try again shortly"},
+            headers={"Retry-After": "1"}
+        )
     
-    def _card_name(self, card):
-        """Get the display name of a card"""
-        return f"{card['rank'].capitalize()} of {card['suit'].capitalize()}"
+    def _play_dealer_hand(self, state, deck, speech):
+        """Play out the dealer's hand according to casino rules, drawing from deck"""
+        self.phrases.dealer_reveals(speech, state.dealer_cards(), state.dealer_score)
+        
+        # Dealer draws cards according to rules
+        while state.dealer_score < 17:
+            new_card = state.deal_dealer(deck)
+            self.phrases.dealer_draws(speech, new_card, state.dealer_score)
+        
+        if state.dealer_score > 21:
+            self.phrases.dealer_busts(speech)
+        else:
+            self.phrases.dealer_stands(speech, state.dealer_score)
     
     def _register_routes(self, router):
         """Override route registration to add custom endpoints"""
@@ -833,8 +1120,9 @@ class BlackjackDealer(AgentBase):
         super()._register_routes(router)
     
     def serve(self, host=None, port=None):
-        """Override serve to use our custom app"""
+        """Override serve to use our custom app, draining gracefully on SIGTERM"""
         import uvicorn
+        from graceful import DrainingServer
         
         host = host or self.host or "0.0.0.0"
         port = port or self.port or 5000
@@ -855,8 +1143,9 @@ class BlackjackDealer(AgentBase):
         print(f"  Health:      http://{host}:{port}/health")
         print("\nPress Ctrl+C to stop\n")
         
+        server = DrainingServer(uvicorn.Config(app, host=host, port=port), self, self.drain_timeout)
         try:
-            uvicorn.run(app, host=host, port=port)
+            server.run()
         except KeyboardInterrupt:
             print("\n🎰 Thanks for playing! The casino is now closed.")
 
@@ -0,0 +1,45 @@
+"""
+Pre-built index of the static web files
+Lets the app resolve request paths once at startup instead of walking the directory on every request
+"""
+
+import mimetypes
+import os
+from pathlib import Path
+
+from fastapi.staticfiles import StaticFiles
+
+
+def build_static_index(web_dir):
+    """Map each file's normalized relative path to its full path"""
+    mimetypes.init()
+    web_dir = Path(web_dir)
+    index = {}
+    for path in web_dir.rglob("*"):
+        if path.is_file():
+            relative = os.path.normpath(str(path.relative_to(web_dir)))
+            index[relative] = str(path)
+            mimetypes.guess_type(path.name)
+    return index
+
+
+class IndexedStaticFiles(StaticFiles):
+    """StaticFiles that answers lookups from a pre-built index, falling back to disk"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.index = {}
+
+    def warm(self):
+        self.index = build_static_index(self.directory)
+        return len(self.index)
+
+    def lookup_path(self, path):
+        full_path = self.index.get(os.path.normpath(path))
+        if full_path is not None:
+            try:
+                # Fresh stat, so a file edited since warm() goes out with its current size and ETag
+                return full_path, os.stat(full_path)
+            except OSError:
+                pass
+        return super().lookup_path(path)
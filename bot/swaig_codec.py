@@ -0,0 +1,80 @@
+"""
+JSON codec for SWAIG/SWML request parsing and response serialization
+Uses orjson when it is installed and falls back to the standard library
+"""
+
+import json
+import os
+
+
+class Codec:
+    """A named pair of loads/dumps functions - dumps always returns bytes"""
+
+    __slots__ = ("name", "loads", "dumps")
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+CODECS = {
+    "json": Codec("json", json.loads, _stdlib_dumps)
+}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+else:
+    CODECS["orjson"] = Codec("orjson", orjson.loads, orjson.dumps)
+
+# Fastest first - BLACKJACK_JSON_CODEC forces a specific one
+PREFERENCE = ["orjson", "json"]
+
+
+def register_codec(name, loads, dumps, preferred=False):
+    """Plug in another JSON library (dumps must return bytes)"""
+    CODECS[name] = Codec(name, loads, dumps)
+    if preferred:
+        PREFERENCE.insert(0, name)
+    else:
+        PREFERENCE.insert(len(PREFERENCE) - 1, name)
+
+
+def get_codec(name=None):
+    """Return the requested codec, or the fastest one available"""
+    name = name or os.environ.get("BLACKJACK_JSON_CODEC")
+    if name:
+        if name not in CODECS:
+            raise ValueError(f"JSON codec '{name}' is not available (have: {', '.join(CODECS)})")
+        return CODECS[name]
+    for candidate in PREFERENCE:
+        if candidate in CODECS:
+            return CODECS[candidate]
+
+
+_active = get_codec()
+
+
+def use_codec(name=None):
+    """Switch the module-level codec used by loads()/dumps()"""
+    global _active
+    _active = get_codec(name)
+    return _active
+
+
+def active_codec():
+    return _active.name
+
+
+def loads(data):
+    return _active.loads(data)
+
+
+def dumps(obj):
+    return _active.dumps(obj)
@@ -0,0 +1,258 @@
+"""
+Multi-table engine - every table is an asyncio actor with its own mailbox
+Tool calls for the same table run one at a time, different tables run independently
+"""
+
+import asyncio
+import inspect
+import random
+import time
+from array import array
+
+from table_state import TableState, new_deck, pack_cards, wire_cards
+
+# Reshuffle when the shoe has fewer than this many cards per seat
+RESHUFFLE_CARDS_PER_SEAT = 15
+
+
+class Seat:
+    """One call sitting at a table"""
+
+    __slots__ = ("call_id", "joined", "last_seen", "game_state")
+
+    def __init__(self, call_id, now):
+        self.call_id = call_id
+        self.joined = now
+        self.last_seen = now
+        self.game_state = None  # Last TableState this call saved
+
+
+class Table:
+    """A table actor - seats, one shared shoe and a mailbox drained by a single task"""
+
+    def __init__(self, table_id, deck_factory, rng, idle_timeout=30.0):
+        self.table_id = table_id
+        self.deck_factory = deck_factory
+        self.rng = rng
+        self.idle_timeout = idle_timeout
+        self.seats = {}
+        self.shoe = array("B")  # Card codes, see table_state
+        self.mailbox = asyncio.Queue()
+        self.processed = 0
+        self.last_active = time.monotonic()
+        self._task = None
+
+    @property
+    def shared(self):
+        """A table someone explicitly sat at, rather than a call's private table"""
+        return self.table_id not in self.seats or len(self.seats) > 1
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def prepare_shoe(self):
+        """Reshuffle if the shoe is running low - returns True if a fresh shoe was shuffled"""
+        seats = max(1, len(self.seats))
+        if len(self.shoe) >= RESHUFFLE_CARDS_PER_SEAT * seats:
+            return False
+        self.shoe = array("B", [code for _ in range(seats) for code in self.deck_factory()])
+        self.rng.shuffle(self.shoe)
+        return True
+
+    async def call(self, fn, *args):
+        """Queue fn(*args) on this table and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self.mailbox.put_nowait((fn, args, future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        """Drain the mailbox one message at a time, exit after idle_timeout with nothing to do"""
+        while True:
+            if not self.mailbox.empty():
+                fn, args, future = self.mailbox.get_nowait()
+            else:
+                try:
+                    fn, args, future = await asyncio.wait_for(self.mailbox.get(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if self.mailbox.empty():
+                        return
+                    continue
+
+            if future.cancelled():
+                continue
+            try:
+                result = fn(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            self.processed += 1
+            self.last_active = time.monotonic()
+
+    def stats(self):
+        """Counts only - call IDs never leave the engine"""
+        return {
+            "seats": len(self.seats),
+            "shoe_cards": len(self.shoe),
+            "queued": self.mailbox.qsize(),
+            "processed": self.processed,
+            "running": self.running
+        }
+
+
+class TableEngine:
+    """Routes each call to its table actor - calls that never sat down get a private table"""
+
+    def __init__(self, deck_factory=new_deck, rng=None, idle_timeout=30.0, seat_ttl=1800.0):
+        self.deck_factory = deck_factory
+        self.rng = rng or random.Random()
+        self.idle_timeout = idle_timeout
+        self.seat_ttl = seat_ttl
+        self.tables = {}
+        self.seating = {}  # call_id -> table_id
+        self._last_sweep = time.monotonic()
+
+    def _table(self, table_id):
+        table = self.tables.get(table_id)
+        if table is None:
+            table = self.tables[table_id] = Table(table_id, self.deck_factory, self.rng, self.idle_timeout)
+        return table
+
+    def seat(self, table_id, call_id):
+        """Sit a call at a table (moving it from any other table)"""
+        if self.seating.get(call_id) not in (None, table_id):
+            self.leave(call_id)
+        table = self._table(table_id)
+        if call_id not in table.seats:
+            table.seats[call_id] = Seat(call_id, time.monotonic())
+        self.seating[call_id] = table_id
+        return table
+
+    def leave(self, call_id):
+        """Remove a call from its table, dropping the table once it is empty"""
+        table_id = self.seating.pop(call_id, None)
+        table = self.tables.get(table_id)
+        if table is None:
+            return
+        table.seats.pop(call_id, None)
+        if not table.seats and table.mailbox.empty():
+            del self.tables[table_id]
+
+    def table_id_for(self, call_id):
+        return self.seating.get(call_id, call_id)
+
+    def table_for_call(self, call_id):
+        """The call's table, seating it at a private table of its own if needed"""
+        table_id = self.seating.get(call_id)
+        if table_id is None:
+            return self.seat(call_id, call_id)
+        return self.tables[table_id]
+
+    def shared_table_for(self, call_id):
+        """The call's table if it shares a shoe with other seats, otherwise None"""
+        table = self.tables.get(self.seating.get(call_id))
+        if table is not None and table.shared:
+            return table
+        return None
+
+    async def submit(self, call_id, fn, *args):
+        """Run fn(*args) on the call's table actor - directly if there is no call to route by"""
+        if call_id is None:
+            result = fn(*args)
+            return await result if inspect.isawaitable(result) else result
+        now = time.monotonic()
+        if now - self._last_sweep > self.idle_timeout:
+            self._sweep(now)
+        table = self.table_for_call(call_id)
+        table.seats[call_id].last_seen = now
+        return await table.call(fn, *args)
+
+    def record_state(self, call_id, game_state):
+        """Remember the last TableState a seated call saved"""
+        table = self.tables.get(self.seating.get(call_id))
+        if table is not None and call_id in table.seats:
+            table.seats[call_id].game_state = game_state
+
+    def recorded_state(self, call_id):
+        """The last TableState a call saved, if this process (or the one before it) saw it"""
+        table = self.tables.get(self.seating.get(call_id))
+        if table is not None and call_id in table.seats:
+            return table.seats[call_id].game_state
+        return None
+
+    def to_dict(self):
+        """Snapshot seats, shared shoes and each seat's last game_state for the next process"""
+        now = time.monotonic()
+        return {
+            table_id: {
+                "shoe": wire_cards(table.shoe),
+                "seats": {
+                    call_id: {
+                        "idle": now - seat.last_seen,
+                        "game_state": seat.game_state.to_wire() if seat.game_state else None
+                    }
+                    for call_id, seat in table.seats.items()
+                }
+            }
+            for table_id, table in self.tables.items()
+        }
+
+    def restore(self, data, age=0.0):
+        """Load a snapshot taken `age` seconds ago, skipping seats that would have expired since"""
+        now = time.monotonic()
+        restored = 0
+        for table_id, snapshot in data.items():
+            for call_id, seat_data in snapshot["seats"].items():
+                idle = seat_data["idle"] + age
+                if idle > self.seat_ttl:
+                    continue
+                table = self.seat(table_id, call_id)
+                seat = table.seats[call_id]
+                seat.last_seen = now - idle
+                game_state = seat_data["game_state"]
+                seat.game_state = TableState.from_wire(game_state) if game_state else None
+                restored += 1
+            if table_id in self.tables:
+                self.tables[table_id].shoe = pack_cards(snapshot["shoe"])
+        return restored
+
+    def _sweep(self, now):
+        """Unseat calls that have gone quiet for longer than seat_ttl, and drop tables left empty
+        (leave() keeps a table whose last seat left with messages still queued)"""
+        self._last_sweep = now
+        stale = [
+            seat.call_id
+            for table in self.tables.values()
+            for seat in table.seats.values()
+            if now - seat.last_seen > self.seat_ttl
+        ]
+        for call_id in stale:
+            self.leave(call_id)
+        empty = [
+            table_id
+            for table_id, table in self.tables.items()
+            if not table.seats and table.mailbox.empty() and not table.running
+        ]
+        for table_id in empty:
+            del self.tables[table_id]
+
+    def stats(self):
+        """Totals across tables - no table or call IDs, since a call ID is enough to act for that call"""
+        tables = [table.stats() for table in self.tables.values()]
+        shared = [table.stats() for table in self.tables.values() if table.shared]
+        return {
+            "tables": len(tables),
+            "seated_calls": len(self.seating),
+            "shared_tables": len(shared),
+            "shared_seats": sum(table["seats"] for table in shared),
+            "running": sum(table["running"] for table in tables),
+            "queued": sum(table["queued"] for table in tables),
+            "processed": sum(table["processed"] for table in tables)
+        }
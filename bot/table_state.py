@@ -0,0 +1,115 @@
+"""
+Compact table state - what the tool handlers work on between reading and writing the wire game_state
+Hands and decks are byte arrays of card codes, and every card is one of 52 interned dicts shared by all tables
+"""
+
+from array import array
+
+from blackjack_rules import CARD_CODES, create_deck
+
+# The interned cards, indexed by code - shared by every table and every reply, so never mutate one
+CARDS = tuple(create_deck())
+CARD_VALUES = tuple(card['value'] for card in CARDS)
+ACES = frozenset(code for code, card in enumerate(CARDS) if card['rank'] == 'ace')
+FULL_DECK = array("B", range(len(CARDS)))
+
+
+def new_deck():
+    """A fresh, unshuffled 52-card deck of codes"""
+    return array("B", FULL_DECK)
+
+
+def pack_cards(cards):
+    """Wire card dicts -> array of codes"""
+    return array("B", [CARD_CODES[(card['rank'], card['suit'])] for card in cards])
+
+
+def wire_cards(codes):
+    """Array of codes -> list of the interned wire card dicts"""
+    return [CARDS[code] for code in codes]
+
+
+def hand_score(hand):
+    """Same total as blackjack_rules.calculate_score, from codes"""
+    score = sum(CARD_VALUES[code] for code in hand)
+    aces = sum(1 for code in hand if code in ACES)
+
+    while score > 21 and aces > 0:
+        score -= 10
+        aces -= 1
+
+    return score
+
+
+class TableState:
+    """One call's game - the wire game_state with its card lists packed into byte arrays"""
+
+    __slots__ = (
+        "deck", "player_hand", "dealer_hand", "player_score", "dealer_score",
+        "current_bet", "player_chips", "game_phase", "hand_in_progress"
+    )
+
+    def __init__(self, player_chips=1000):
+        self.deck = array("B")
+        self.player_hand = array("B")
+        self.dealer_hand = array("B")
+        self.player_score = 0
+        self.dealer_score = 0
+        self.current_bet = 0
+        self.player_chips = player_chips
+        self.game_phase = "waiting"  # waiting, bet_placed, playing, resolution
+        self.hand_in_progress = False
+
+    @classmethod
+    def from_wire(cls, game_state):
+        """Unpack a game_state dict from global_data (or a handoff file)"""
+        state = cls(game_state.get("player_chips", 1000))
+        state.deck = pack_cards(game_state.get("deck", []))
+        state.player_hand = pack_cards(game_state.get("player_hand", []))
+        state.dealer_hand = pack_cards(game_state.get("dealer_hand", []))
+        state.player_score = game_state.get("player_score", 0)
+        state.dealer_score = game_state.get("dealer_score", 0)
+        state.current_bet = game_state.get("current_bet", 0)
+        state.game_phase = game_state.get("game_phase", "waiting")
+        state.hand_in_progress = game_state.get("hand_in_progress", False)
+        return state
+
+    def to_wire(self):
+        """The game_state dict saved to global_data"""
+        return {
+            "deck": wire_cards(self.deck),
+            "player_hand": wire_cards(self.player_hand),
+            "dealer_hand": wire_cards(self.dealer_hand),
+            "player_score": self.player_score,
+            "dealer_score": self.dealer_score,
+            "current_bet": self.current_bet,
+            "player_chips": self.player_chips,
+            "game_phase": self.game_phase,
+            "hand_in_progress": self.hand_in_progress
+        }
+
+    def clear_hands(self):
+        self.player_hand = array("B")
+        self.dealer_hand = array("B")
+        self.player_score = 0
+        self.dealer_score = 0
+
+    def deal_player(self, deck):
+        """Move the top card of deck to the player's hand - returns the card"""
+        code = deck.pop()
+        self.player_hand.append(code)
+        self.player_score = hand_score(self.player_hand)
+        return CARDS[code]
+
+    def deal_dealer(self, deck):
+        """Move the top card of deck to the dealer's hand - returns the card"""
+        code = deck.pop()
+        self.dealer_hand.append(code)
+        self.dealer_score = hand_score(self.dealer_hand)
+        return CARDS[code]
+
+    def player_cards(self):
+        return wire_cards(self.player_hand)
+
+    def dealer_cards(self):
+        return wire_cards(self.dealer_hand)